@@ -0,0 +1,93 @@
+'''
+GUI Algorithm Simulation
+MIT License
+Copyright (c) 2024 Artur Mazurkiewicz
+'''
+
+
+
+import numpy as np
+
+
+PROG_DECYMACJI = 5000       # do tej liczby próbek w widocznym zakresie rysowane są wszystkie
+
+
+def minmax(x, y, x0, x1, n_kosz):
+    # x rosnące - zakres [x0, x1] dzielony na n_kosz przedziałów, z każdego pierwsza próbka oraz minimum
+    # i maksimum y; kształt krzywej na ekranie o szerokości n_kosz pikseli pozostaje bez zmian
+    i0 = max(int(np.searchsorted(x, x0, 'left')) - 1, 0)
+    i1 = min(int(np.searchsorted(x, x1, 'right')) + 1, len(x))
+    if i1 - i0 <= max(PROG_DECYMACJI, 4 * n_kosz):
+        return np.arange(i0, i1)
+
+    m = (i1 - i0) // n_kosz
+    koniec = i0 + m * n_kosz
+    blok = y[i0:koniec].reshape(n_kosz, m)
+    baza = i0 + m * np.arange(n_kosz)
+    czesci = [baza, baza + blok.argmin(axis=1), baza + blok.argmax(axis=1), [i1 - 1]]
+    if koniec < i1:
+        reszta = y[koniec:i1]
+        czesci.append([koniec + reszta.argmin(), koniec + reszta.argmax()])
+    return np.unique(np.concatenate(czesci))
+
+
+def siatka(x, y, x0, x1, y0, y1, nx, ny):
+    # punkty w dowolnej kolejności - po jednym punkcie z każdej zajętej komórki siatki nx x ny, komórka
+    # nie większa od znacznika, więc zajęte obszary wykresu punktowego pozostają pokryte
+    widoczne = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+    if len(widoczne) <= PROG_DECYMACJI:
+        return widoczne
+
+    kx = np.minimum(((x[widoczne] - x0) * (nx / (x1 - x0))).astype(np.int64), nx - 1)
+    ky = np.minimum(((y[widoczne] - y0) * (ny / (y1 - y0))).astype(np.int64), ny - 1)
+    komorki = kx * ny + ky
+    reprezentant = np.empty(nx * ny, dtype=np.int64)
+    reprezentant[komorki] = widoczne            # przy powtórzeniach zostaje dowolny punkt komórki
+    zajete = np.zeros(nx * ny, dtype=bool)
+    zajete[komorki] = True
+    return np.sort(reprezentant[zajete])
+
+
+class Decymacja:
+    # linia matplotlib rysowana z pełnych tablic x, y przerzedzonych do rozdzielczości osi; po zmianie
+    # zakresu osi (przybliżenie, przesunięcie) lub rozmiaru okna próbki wybierane są ponownie
+
+    def __init__(self, linia, x, y, punkty=False, n=None):
+        self.linia = linia
+        self.ax = linia.axes
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.punkty = punkty                    # True - wykres punktowy (x nieuporządkowane)
+        self.n = len(self.x) if n is None else n    # liczba pierwszych próbek do pokazania (animacja)
+        self.indeksy = None
+
+        self.ax.callbacks.connect('xlim_changed', self.zmiana_zakresu)
+        if punkty:
+            self.ax.callbacks.connect('ylim_changed', self.zmiana_zakresu)
+        self.ax.figure.canvas.mpl_connect('resize_event', self.zmiana_zakresu)
+
+    def wybierz(self):
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        x0, x1, y0, y1 = min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)
+        okno = self.ax.get_window_extent()
+        if self.punkty:
+            # komórka o boku średnicy znacznika (co najmniej piksel), a przy dużym oknie i małym znaczniku
+            # siatka zmniejszana do PROG_DECYMACJI komórek - liczba rysowanych punktów nie rośnie z rozmiarem okna
+            bok = max(self.linia.get_markersize() * self.ax.figure.dpi / 72, 1)
+            nx, ny = max(okno.width / bok, 1), max(okno.height / bok, 1)
+            skala = max(np.sqrt(nx * ny / PROG_DECYMACJI), 1)
+            self.indeksy = siatka(self.x, self.y, x0, x1, y0, y1, max(int(nx / skala), 1), max(int(ny / skala), 1))
+        else:
+            self.indeksy = minmax(self.x, self.y, x0, x1, max(int(okno.width), 1))
+
+    def pokaz(self, n=None):
+        if n is not None:
+            self.n = n
+        if self.indeksy is None:
+            self.wybierz()
+        indeksy = self.indeksy[:np.searchsorted(self.indeksy, self.n)]
+        self.linia.set_data(self.x[indeksy], self.y[indeksy])
+
+    def zmiana_zakresu(self, *_):
+        self.indeksy = None
+        self.pokaz()
@@ -6,8 +6,379 @@ Copyright (c) 2024 Artur Mazurkiewicz
 
 
 
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
 import numpy as np
-from scipy import signal
+from scipy import signal, linalg
+from scipy.stats import qmc
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def macierz_pasmowa(N, przek_wart):
+    # górna postać pasmowa (jak w scipy.linalg.solveh_banded): wiersz k - d zawiera d-tą przekątną
+    k = max([sublst[0] for sublst in przek_wart], default=0)
+    pasma = np.zeros((k + 1, N))
+    pasma[k] = 1
+    for sublst in przek_wart:
+        pasma[k - sublst[0], sublst[0]:] += sublst[1]
+    return pasma
+
+
+def mnoz_pasmowa(pasma, X):
+    # iloczyn symetrycznej macierzy pasmowej i macierzy X (N x p) bez budowy macierzy N x N
+    k = pasma.shape[0] - 1
+    wynik = pasma[k].reshape(-1, 1) * X
+    for d in range(1, k + 1):
+        wart = pasma[k - d, d:].reshape(-1, 1)
+        wynik[:-d] += wart * X[d:]
+        wynik[d:] += wart * X[:-d]
+    return wynik
+
+
+def rozwiaz_mnk(U_m, y):
+    # estymator LS przez rozkład QR skalowanej macierzy U_m.T (bez jawnego odwracania U_m @ U_m.T)
+    # zwraca b (dla y o wymiarze N x R - macierz p x R), (U_m @ U_m.T)^-1 i wskaźnik uwarunkowania
+    skala = np.linalg.norm(U_m, axis=1)
+    skala[skala == 0] = 1
+    Q, R = np.linalg.qr(U_m.T / skala)
+    b = linalg.solve_triangular(R, Q.T @ y)
+    R_odwr = linalg.solve_triangular(R, np.eye(len(skala)))
+    odwr = (R_odwr @ R_odwr.T) / np.outer(skala, skala)
+    return (b.T / skala).T, odwr, np.linalg.cond(R)
+
+
+def klucz_pasm(przek_wart):
+    return tuple((int(sublst[0]), float(sublst[1])) for sublst in przek_wart)
+
+
+def wybiel(czynnik, X):
+    # rozwiązanie czynnik.T @ W = X, czyli dane przekształcone do zakłóceń nieskorelowanych
+    k = czynnik.shape[0] - 1
+    dolna = np.zeros_like(czynnik)
+    for d in range(k + 1):
+        dolna[d, :czynnik.shape[1] - d] = czynnik[k - d, d:]
+    return linalg.solve_banded((k, 0), dolna, X)
+
+
+def macierz_wejsc(u, stopien):
+    # wiersz -st-1 zawiera u ** st; potęgi wyznaczane iloczynami skumulowanymi (np.vander)
+    return np.ascontiguousarray(np.vander(u, stopien + 1).T)
+
+
+@lru_cache(maxsize=3)
+def siatka_wejsc(range_min, range_max, N, stopien):
+    # równomierna siatka wejść i jej macierz wejść, współdzielone między kolejnymi symulacjami (tylko do odczytu);
+    # mała pamięć podręczna - bieżąca siatka, siatka odpowiedzi modelu i jedna poprzednia (przy dużym N każda
+    # zajmuje dziesiątki MB)
+    u = np.linspace(range_min, range_max, N)
+    U = macierz_wejsc(u, stopien)
+    u.setflags(write=False)
+    U.setflags(write=False)
+    return u, U
+
+
+@lru_cache(maxsize=3)
+def czynnik_pasmowy(N, przek_wart):
+    # czynnik Choleskiego (postać pasmowa górna) macierzy korelacji, przek_wart jako krotka krotek;
+    # pamiętane tylko ostatnie czynniki - każdy ma rozmiar (szerokość pasma + 1) x N
+    czynnik = linalg.cholesky_banded(macierz_pasmowa(N, przek_wart))
+    czynnik.setflags(write=False)
+    return czynnik
+
+
+def zaklocenie_skorelowane(N, przek_wart, od_std, R=None):
+    # zakłócenie o macierzy kowariancji od_std^2 * macierz: e = czynnik.T @ z, dla R realizacji wynik R x N
+    czynnik = czynnik_pasmowy(N, klucz_pasm(przek_wart))
+    k = czynnik.shape[0] - 1
+    z = np.random.standard_normal(N if R is None else (R, N))
+    e = czynnik[k] * z
+    for d in range(1, k + 1):
+        e[..., d:] += czynnik[k - d, d:] * z[..., :-d]
+    return od_std * e
+
+
+def _rls_petla(U, y, P, b_, start, wsp_zap):
+    # jeden krok RLS na próbkę: skalarny mianownik i symetryczna aktualizacja rzędu 1 macierzy P
+    p, N = U.shape
+    Pu = np.zeros(p)
+    for i in range(start, N):
+        mian = wsp_zap
+        for r in range(p):
+            s = 0.0
+            for c in range(p):
+                s += P[r, c] * U[c, i]
+            Pu[r] = s
+            mian += U[r, i] * s
+        e = y[i]
+        for r in range(p):
+            e -= U[r, i] * b_[r, i - 1]
+        for r in range(p):
+            b_[r, i] = b_[r, i - 1] + Pu[r] * e / mian
+        for r in range(p):
+            for c in range(r, p):
+                P[r, c] = (P[r, c] - Pu[r] * Pu[c] / mian) / wsp_zap
+                P[c, r] = P[r, c]
+    return P
+
+
+def _rls_numpy(U, y, P, b_, start, wsp_zap):
+    for i in range(start, U.shape[1]):
+        u = U[:, i]
+        Pu = P @ u
+        mian = u @ Pu + wsp_zap
+        b_[:, i] = b_[:, i - 1] + Pu * ((y[i] - u @ b_[:, i - 1]) / mian)
+        P = (P - np.outer(Pu, Pu) / mian) / wsp_zap     # iloczyn Pu Pu^T dokładnie symetryczny
+    return P
+
+
+def _rls_pierw_petla(U, y, S, b_, start, wsp_zap):
+    # wariant pierwiastkowy Pottera: P = S S^T, aktualizowany jest tylko czynnik S
+    p, N = U.shape
+    fi = np.zeros(p)
+    Sfi = np.zeros(p)
+    pierw_zap = np.sqrt(wsp_zap)
+    for i in range(start, N):
+        alfa = wsp_zap
+        for c in range(p):
+            s = 0.0
+            for r in range(p):
+                s += S[r, c] * U[r, i]
+            fi[c] = s
+            alfa += s * s
+        for r in range(p):
+            s = 0.0
+            for c in range(p):
+                s += S[r, c] * fi[c]
+            Sfi[r] = s
+        e = y[i]
+        for r in range(p):
+            e -= U[r, i] * b_[r, i - 1]
+        for r in range(p):
+            b_[r, i] = b_[r, i - 1] + Sfi[r] * e / alfa
+        gamma = 1.0 / (alfa + np.sqrt(wsp_zap * alfa))
+        for r in range(p):
+            for c in range(p):
+                S[r, c] = (S[r, c] - gamma * Sfi[r] * fi[c]) / pierw_zap
+    return S
+
+
+def _rls_pierw_numpy(U, y, S, b_, start, wsp_zap):
+    pierw_zap = np.sqrt(wsp_zap)
+    for i in range(start, U.shape[1]):
+        u = U[:, i]
+        fi = u @ S
+        Sfi = S @ fi
+        alfa = fi @ fi + wsp_zap
+        b_[:, i] = b_[:, i - 1] + Sfi * ((y[i] - u @ b_[:, i - 1]) / alfa)
+        S = (S - np.outer(Sfi / (alfa + np.sqrt(wsp_zap * alfa)), fi)) / pierw_zap
+    return S
+
+
+# w wersji z PyInstallera brak katalogu źródeł na pamięć podręczną numby ("no locator available") - kompilacja przy starcie
+_CACHE_JIT = not getattr(sys, 'frozen', False)
+_rls_jit = njit(cache=_CACHE_JIT)(_rls_petla) if njit is not None else None
+_rls_pierw_jit = njit(cache=_CACHE_JIT)(_rls_pierw_petla) if njit is not None else None
+
+
+def rls_pierwiastkowy(U, y, P, b_, start, wsp_zap=1.0, postep=None):
+    # macierz P przechowywana jako czynnik Choleskiego - pozostaje symetryczna i dodatnio określona
+    # także przy długich przebiegach z dużym alfa i zapominaniem
+    S = linalg.cholesky(np.array(P, dtype=float), lower=True)
+    y = np.asarray(y, dtype=float)
+    for i0, i1 in odcinki(start, U.shape[1], postep):
+        if _rls_pierw_jit is not None:
+            S = _rls_pierw_jit(U[:, :i1], y[:i1], S, b_[:, :i1], i0, float(wsp_zap))
+        else:
+            S = _rls_pierw_numpy(U[:, :i1], y[:i1], S, b_[:, :i1], i0, wsp_zap)
+    return S @ S.T
+
+
+class PrzerwanoObliczenia(Exception):
+    # zgłaszany przez funkcję postępu, gdy użytkownik anulował obliczenia
+    pass
+
+
+def zglos(postep, ulamek):
+    # postep(ulamek) - wywoływana w punktach kontrolnych obliczeń, może przerwać je wyjątkiem PrzerwanoObliczenia
+    if postep is not None:
+        postep(ulamek)
+
+
+def odcinki(start, N, postep, krok=1):
+    # bez funkcji postępu cały przebieg naraz, w przeciwnym razie ok. 50 odcinków (długość - wielokrotność krok)
+    # z postępem zgłaszanym po każdym z nich
+    if postep is None:
+        yield start, N
+        return
+    dl = krok * max(1, -(-(N - start) // (50 * krok)))
+    for i0 in range(start, N, dl):
+        i1 = min(i0 + dl, N)
+        yield i0, i1
+        postep((i1 - start) / (N - start))
+
+
+def rls_blokowy(U, y, P, b_, start, wsp_zap=1.0, blok=128, pelna=False):
+    # aktualizacja paczkami po blok próbek (lemat o odwracaniu macierzy w postaci blokowej), wynik jak próbka po próbce;
+    # dla paczki Ub (p x k): S = Ub^T P Ub + diag(wsp_zap^(1+j)) = L L^T, G = P Ub L^-T, z = L^-1 (y - Ub^T b),
+    # b <- b + G z, P <- (P - G G^T) / wsp_zap^k
+    # pelna=False - estymata tylko na końcu paczki (w pozostałych próbkach poprzednia), pelna=True - w każdej próbce
+    for i0 in range(start, U.shape[1], blok):
+        i1 = min(i0 + blok, U.shape[1])
+        Ub = U[:, i0:i1]
+        b = b_[:, i0 - 1]
+        PU = P @ Ub
+        S = Ub.T @ PU
+        S[np.diag_indices_from(S)] += wsp_zap ** np.arange(1, i1 - i0 + 1)
+        L = linalg.cholesky(S, lower=True)
+        z = linalg.solve_triangular(L, y[i0:i1] - b @ Ub, lower=True)
+        G = linalg.solve_triangular(L, PU.T, lower=True).T
+        if pelna:
+            # estymaty pośrednie - kolejne wiodące podmacierze S mają czynniki będące wiodącymi blokami L
+            b_[:, i0:i1] = b[:, None] + np.cumsum(G * z, axis=1)
+        else:
+            b_[:, i0:i1 - 1] = b[:, None]
+            b_[:, i1 - 1] = b + G @ z
+        P = (P - G @ G.T) / wsp_zap ** (i1 - i0)
+    return P
+
+
+def rls(U, y, P, b_, start, wsp_zap=1.0, blok=0, pelna=False, pierwiastkowy=False, postep=None):
+    # uzupełnia trajektorię b_ (p x N) od próbki start, zwraca końcową macierz P
+    # wersja kompilowana (numba), gdy dostępna, w przeciwnym razie wektorowa pętla NumPy; blok > 0 - aktualizacja paczkami,
+    # pierwiastkowy - aktualizacja czynnika P (Potter)
+    P = np.array(P, dtype=float)
+    if pierwiastkowy:
+        return rls_pierwiastkowy(U, y, P, b_, start, wsp_zap, postep)
+    y = np.asarray(y, dtype=float)
+    for i0, i1 in odcinki(start, U.shape[1], postep, blok or 1):
+        if blok:
+            P = rls_blokowy(U[:, :i1], y[:i1], P, b_[:, :i1], i0, wsp_zap, blok, pelna)
+        elif _rls_jit is not None:
+            P = _rls_jit(U[:, :i1], y[:i1], P, b_[:, :i1], i0, float(wsp_zap))
+        else:
+            P = _rls_numpy(U[:, :i1], y[:i1], P, b_[:, :i1], i0, wsp_zap)
+    return P
+
+
+@lru_cache(maxsize=32)
+def dyskretyzacja(G, dt):
+    # dyskretyzacja z ekstrapolacją pierwszego rzędu (jak lsim z interp=True), G jako krotka (licznik, mianownik);
+    # x[k+1] = Ad x[k] + Bd0 u[k] + Bd1 u[k+1], y[k] = C x[k] + D u[k]
+    A, B, C, D = signal.tf2ss(*G)
+    n = A.shape[0]
+    M = np.zeros((n + 2, n + 2))
+    M[:n, :n] = A * dt
+    M[:n, n] = B[:, 0] * dt
+    M[n, n + 1] = 1
+    E = linalg.expm(M)
+    Bd1 = E[:n, n + 1]
+    Bd0 = E[:n, n] - Bd1
+
+    licz_0, mian = signal.ss2tf(E[:n, :n], Bd0[:, None], C, D)
+    licz_1 = signal.ss2tf(E[:n, :n], Bd1[:, None], C, np.zeros_like(D))[0][0]
+    licz_1 = np.append(licz_1[1:], 0)                   # mnożenie przez z - wejście u[k+1]
+
+    # lsim startuje z zerowym stanem, filtr zakłada x[0] = Bd1 u[0] - odpowiedź swobodna do odjęcia
+    filtr = (licz_0[0] + licz_1, mian, licz_1)
+    for wsp in filtr:
+        wsp.setflags(write=False)
+    return filtr
+
+
+def symuluj_dyskretnie(G, dt, u):
+    # odpowiedź obiektu na pobudzenie u (N lub R x N) jednym przebiegiem filtru IIR wzdłuż ostatniej osi
+    licz, mian, licz_swob = dyskretyzacja((tuple(G[0]), tuple(G[1])), dt)
+    impuls = np.zeros(u.shape[-1])
+    impuls[0] = 1
+    return signal.lfilter(licz, mian, u) - u[..., :1] * signal.lfilter(licz_swob, mian, impuls)
+
+
+def trajektoria_pusta(bufor, ksztalt):
+    # miejsce na trajektorię estymat: nowa tablica lub podany bufor (np. plik mapowany w pamięć)
+    if bufor is None:
+        return np.zeros(ksztalt)
+    if bufor.shape != ksztalt:
+        raise ValueError(f'Bufor trajektorii ma wymiary {bufor.shape}, oczekiwano {ksztalt}')
+    return bufor
+
+
+def _tablica(x):
+    # float64 bez kopiowania, gdy to możliwe; opisy nieregularne (np. parametry niestacjonarne) bez zmian
+    if x is None:
+        return None
+    try:
+        return np.asarray(x, dtype=np.float64)
+    except (TypeError, ValueError):
+        return x
+
+
+class Wynik:
+    # wynik estymacji; iteracja i indeksowanie jak dotychczasowa krotka
+    # (metoda_typ, u, y, y_m_aprox, b_m, b, b_wzorzec, cov, uwarunkowanie)
+    POLA = ('metoda_typ', 'u', 'y', 'y_m_aprox', 'b_m', 'b', 'b_wzorzec', 'cov', 'uwarunkowanie')
+    __slots__ = ('metoda_typ', 'u', 'y', 'y_m_aprox', 'b_m', 'b', 'b_wzorzec', 'uwarunkowanie', 'y_m',
+                 '_cov', '_reszty', '_blad')
+
+    def __init__(self, metoda_typ, u, y, y_m_aprox, b_m, b, b_wzorzec=None, cov=None, uwarunkowanie=None, y_m=None):
+        self.metoda_typ = metoda_typ
+        self.u = _tablica(u)
+        self.y = _tablica(y)
+        self.y_m_aprox = _tablica(y_m_aprox)
+        self.b_m = _tablica(b_m)
+        self.b = _tablica(b)
+        self.b_wzorzec = _tablica(b_wzorzec)
+        self.uwarunkowanie = uwarunkowanie
+        self.y_m = _tablica(y_m)              # odpowiedź modelu w punktach pomiarowych
+        self._cov = cov                       # tablica lub funkcja bezargumentowa liczona przy pierwszym odczycie
+        self._reszty = None
+        self._blad = None
+
+    @property
+    def cov(self):
+        if callable(self._cov):
+            self._cov = self._cov()
+        return self._cov
+
+    @property
+    def reszty(self):
+        if self._reszty is None and self.y_m is not None:
+            self._reszty = self.y - self.y_m
+        return self._reszty
+
+    @property
+    def blad(self):
+        # błąd estymat względem wartości prawdziwych (dla WRLS - trajektoria, dla metody korelacyjnej - odp. impulsowa)
+        if self._blad is None:
+            if self.metoda_typ == 'korelacyjny':
+                self._blad = self.y_m_aprox - self.y
+            elif self.b_wzorzec is not None:
+                self._blad = self.b_m - self.b_wzorzec.T
+            else:
+                self._blad = self.b_m - self.b
+        return self._blad
+
+    def __iter__(self):
+        return (getattr(self, pole) for pole in self.POLA)
+
+    def __getitem__(self, nr):
+        # tylko odczytywane pola - leniwe cov liczone wyłącznie przy odwołaniu do niego
+        if isinstance(nr, slice):
+            return tuple(getattr(self, pole) for pole in self.POLA[nr])
+        return getattr(self, self.POLA[nr])
+
+    def __len__(self):
+        return len(self.POLA)
+
+
+def _cov_ls_skorelowane(sigma, odwr, U_m, pasma):
+    # kowariancja estymatora LS przy zakłóceniach skorelowanych: sigma (U U^T)^-1 U M U^T (U U^T)^-1
+    return sigma * odwr @ U_m @ mnoz_pasmowa(pasma, U_m.T) @ odwr
 
 
 class ObiektNieliniowy:
@@ -85,24 +456,18 @@ class Parametry(ObiektLiniowy):
     def calc(self):
         self.zaklocenie = self.od_std * np.random.randn(self.N)
 
-        self.u = np.linspace(self.range_min, self.range_max, self.N)    # wektor wejść
-        self.U = np.zeros((self.stopien+1,self.N))                # macierz wejść - inicjalizacja
-        self.U_m = np.zeros((self.stopien_m+1, self.N))
-
-        for st in range(self.stopien+1):
-            self.U[-st-1] = self.u ** st      # macierz wejść - konstrukcja
-
-        for st in range(self.stopien_m+1):
-            self.U_m[-st-1] = self.u ** st      # macierz wejść - konstrukcja
+        self.macierze_wejsc()
 
         self.y_wzorzec = self.b @ self.U
         self.y = self.y_wzorzec + self.zaklocenie
 
-        self.u_aprox = np.linspace(self.range_min, self.range_max, 1000)
-        self.U_aprox = np.zeros((self.stopien_m+1, 1000))
-
-        for st in range(self.stopien_m+1):
-            self.U_aprox[-st-1] = self.u_aprox ** st      # macierz wejść - konstrukcja
+    def macierze_wejsc(self):
+        # jedna macierz wejść wyższego stopnia; U i U_m to jej ostatnie wiersze (widoki, bez kopiowania)
+        stopien = max(self.stopien, self.stopien_m)
+        self.u, U = siatka_wejsc(self.range_min, self.range_max, self.N, stopien)   # wektor i macierz wejść
+        self.U = U[stopien - self.stopien:]
+        self.U_m = U[stopien - self.stopien_m:]
+        self.u_aprox, self.U_aprox = siatka_wejsc(self.range_min, self.range_max, 1000, self.stopien_m)
 
     def ret(self):
         return self.stopien_m, self.N, self.range_min, self.range_max, self.od_std
@@ -129,10 +494,7 @@ class ParametryNiestacjo(ObiektLiniowy):
                 self.u = np.random.choice(self.u_wz, size=self.N, replace=True)
             case 'losowe':
                 self.u =  np.random.rand(self.N) * (self.range_max - self.range_min) + self.range_min
-        self.U = np.zeros((self.stopien + 1, self.N))  # macierz wejść - inicjalizacja
-
-        for st in range(self.stopien + 1):
-            self.U[-st - 1] = self.u ** st  # macierz wejść - konstrukcja
+        self.U = macierz_wejsc(self.u, self.stopien)  # macierz wejść
 
         self.b_wzorzec = np.zeros((self.N, self.stopien + 1))
 
@@ -145,15 +507,15 @@ class ParametryNiestacjo(ObiektLiniowy):
                 case 'sinus':
                     self.b_wzorzec[:, i] = sublst[2] * np.sin(2 * np.pi / sublst[3] * self.u_wz + np.pi * sublst[4]) + sublst[1]
 
-        self.y_wzorzec = np.diag(np.matmul(self.b_wzorzec, self.U))
-        self.y_last = np.matmul(self.b_wzorzec, self.U)
+        self.y_wzorzec = np.einsum('ij,ji->i', self.b_wzorzec, self.U)    # diagonala b_wzorzec @ U w O(N)
         self.y = self.y_wzorzec + self.zaklocenie
 
-        self.u_aprox = np.linspace(min(self.u), max(self.u), 1000)
-        self.U_aprox = np.zeros((self.stopien + 1, 1000))
+        self.u_aprox, self.U_aprox = siatka_wejsc(min(self.u), max(self.u), 1000, self.stopien)
 
-        for st in range(self.stopien + 1):
-            self.U_aprox[-st - 1] = self.u_aprox ** st  # macierz wejść - konstrukcja
+    @property
+    def y_last(self):
+        # pełna macierz N x N - wyznaczana tylko na żądanie
+        return np.matmul(self.b_wzorzec, self.U)
 
     def ret(self):
         return self.N, self.range_min, self.range_max, self.wymuszenie_typ, self.od_std
@@ -217,14 +579,25 @@ class ParametryDynamiczny(ObiektDynamiczny):
         self.od_std_w = od_std_w
         self.od_std = od_std
         self.dt = range_max / N
+        self.symulacja = 'dyskretna'    # 'dyskretna' (filtr IIR) lub 'lsim' (wersja referencyjna)
 
     def calc(self):
         self.u = self.od_std_w * np.random.randn(self.N)
         self.t = np.linspace(0, self.range_max, self.N)  # wektor wejść
 
-        _, self.y, _1 = signal.lsim(self.G, self.u, self.t, interp=True)
+        if self.symulacja == 'lsim':
+            _, self.y, _1 = signal.lsim(self.G, self.u, self.t, interp=True)
+        else:
+            self.y = symuluj_dyskretnie(self.G, self.t[1] - self.t[0], self.u)
         self.y = self.y + self.od_std * np.random.randn(self.N)
 
+    def realizacje(self, R):
+        # R niezależnych realizacji pobudzenia i zakłócenia symulowanych jednocześnie (R x N)
+        self.t = np.linspace(0, self.range_max, self.N)
+        U = self.od_std_w * np.random.randn(R, self.N)
+        Y = symuluj_dyskretnie(self.G, self.t[1] - self.t[0], U) + self.od_std * np.random.randn(R, self.N)
+        return U, Y
+
     def ret(self):
         return self.N, self.range_max, self.od_std_w, self.od_std
 
@@ -233,47 +606,54 @@ class LS(Parametry):
 
     def __init__(self, obkt, param):
         super().__init__(obkt, param.stopien_m, param.N, param.range_min, param.range_max, param.od_std)
+        self.postep = None              # funkcja postępu, patrz zglos()
 
     def calc(self):
         super().calc()
+        zglos(self.postep, 0.5)
 
-        self.b_m = np.transpose(np.matmul(np.matmul(np.linalg.inv(np.matmul(self.U_m, np.transpose(self.U_m))), self.U_m), self.y))
+        self.b_m, odwr, self.uwarunkowanie = rozwiaz_mnk(self.U_m, self.y)
         self.y_m = np.matmul(self.b_m, self.U_m)
         self.y_m_aprox = np.matmul(self.b_m, self.U_aprox)
 
-        self.cov = self.sigma * np.linalg.inv(np.matmul(self.U_m, np.transpose(self.U_m)))
+        self.cov = self.sigma * odwr
 
         if self.stopien < self.stopien_m:
             self.b = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b))
         else:
             self.b_m = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b_m))
 
-        return 'LS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.cov
+        return Wynik('LS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.cov, self.uwarunkowanie, self.y_m)
 
 
 class RLS(Parametry):
 
-    def __init__(self, obkt, param, alfa, b_0, N_pocz):
+    def __init__(self, obkt, param, alfa, b_0, N_pocz, blok=0, pelna=False, pierwiastkowy=False, trajektoria=None):
         super().__init__(obkt, param.stopien_m, param.N, param.range_min, param.range_max, param.od_std)
         self.alfa = alfa
         self.b_0 = b_0
         self.N_pocz = N_pocz if N_pocz is not None else 0
+        self.blok = blok                # 0 - aktualizacja po każdej próbce, > 0 - paczkami po blok próbek
+        self.pelna = pelna              # trajektoria estymat w każdej próbce także w trybie paczkowym
+        self.pierwiastkowy = pierwiastkowy  # wariant pierwiastkowy (Potter) - stabilny dla długich przebiegów
+        self.trajektoria = trajektoria  # opcjonalny bufor p x N na trajektorię estymat (np. memmap z MagazynWynikow)
+        self.postep = None
 
     def calc(self):
         super().calc()
         if not self.N_pocz:
+            self.uwarunkowanie = None
             self.P = self.alfa * np.eye(self.stopien_m+1)
-            self.b_ = np.hstack((np.transpose(self.b_0), np.zeros((self.stopien_m+1, self.N - 1))))
+            self.b_ = trajektoria_pusta(self.trajektoria, (self.stopien_m+1, self.N))
+            self.b_[:, :1] = np.transpose(self.b_0)
         else:
-            self.P = np.linalg.inv(self.U_m[:, :self.N_pocz] @ self.U_m[:, :self.N_pocz].T)
-            self.b_LS_pocz = (self.P @ self.U_m[:, :self.N_pocz] @ self.y[:self.N_pocz]).reshape(self.stopien_m+1, 1)
-            self.b_ = np.hstack((self.b_LS_pocz * np.ones((self.stopien_m+1, self.N_pocz)), np.zeros((self.stopien_m+1, self.N - self.N_pocz))))
+            b_pocz, self.P, self.uwarunkowanie = rozwiaz_mnk(self.U_m[:, :self.N_pocz], self.y[:self.N_pocz])
+            self.b_LS_pocz = b_pocz.reshape(self.stopien_m+1, 1)
+            self.b_ = trajektoria_pusta(self.trajektoria, (self.stopien_m+1, self.N))
+            self.b_[:, :self.N_pocz] = self.b_LS_pocz
 
-        for i in range(self.N_pocz if self.N_pocz else 1, self.N):
-            self.c = np.linalg.inv((self.U_m[:, i].T @ self.P @ self.U_m[:, i] + 1).reshape(1,1))
-            self.K = self.P @ self.U_m[:, i] * self.c
-            self.b_[:, i] = self.b_[:, i-1] + self.K * (self.y[i] - self.U_m[:, i].T @ self.b_[:, i-1])
-            self.P = self.P - (self.K.reshape(self.stopien_m + 1, 1) @ self.U_m[:, i].reshape(1, self.stopien_m + 1) @ self.P)
+        self.P = rls(self.U_m, self.y, self.P, self.b_, self.N_pocz if self.N_pocz else 1, blok=self.blok,
+                     pelna=self.pelna, pierwiastkowy=self.pierwiastkowy, postep=self.postep)
 
         self.b_m = self.b_[:,self.N - 1]
         self.y_m = np.matmul(self.b_m, self.U_m)
@@ -285,33 +665,103 @@ class RLS(Parametry):
         else:
             self.b_m = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b_m))
 
-        return 'RLS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.sigma * self.P
+        return Wynik('RLS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.sigma * self.P, self.uwarunkowanie,
+                     self.y_m)
 
 
 class RLSZapominanie(ParametryNiestacjo):
-    def __init__(self, obkt, param, alfa, b_0, wsp_zap):
+    def __init__(self, obkt, param, alfa, b_0, wsp_zap, blok=0, pelna=False, pierwiastkowy=False, trajektoria=None):
         super().__init__(obkt, param.N, param.range_min, param.range_max, param.wymuszenie_typ, param.od_std)
         self.alfa = alfa
         self.b_0 = b_0
         self.wsp_zap = wsp_zap
+        self.blok = blok
+        self.pelna = pelna
+        self.pierwiastkowy = pierwiastkowy
+        self.trajektoria = trajektoria
+        self.postep = None
 
     def calc(self):
         super().calc_niestacjo()
         self.P = self.alfa * np.eye(self.stopien+1)
-        self.b_ = np.hstack((np.transpose(self.b_0), np.zeros((self.stopien+1, self.N - 1))))
+        self.b_ = trajektoria_pusta(self.trajektoria, (self.stopien+1, self.N))
+        self.b_[:, :1] = np.transpose(self.b_0)
 
-        for i in range(1, self.N):
-            self.c = np.linalg.inv((self.U[:, i].T @ self.P @ self.U[:, i] + self.wsp_zap).reshape(1, 1))
-            self.K = self.P @ self.U[:, i] * self.c
-            self.b_[:, i] = self.b_[:, i-1] + self.K * (self.y[i] - self.U[:, i].T @ self.b_[:, i-1])
-            self.P = (self.P - (self.K.reshape(self.stopien + 1, 1) @ self.U[:, i].reshape(1, self.stopien + 1) @ self.P)) / self.wsp_zap
+        self.P = rls(self.U, self.y, self.P, self.b_, 1, self.wsp_zap, self.blok, self.pelna, self.pierwiastkowy,
+                     self.postep)
 
         self.b_m = self.b_[:, self.N - 1]
         self.y_m = np.matmul(self.b_m, self.U)
 
         self.y_m_aprox = np.matmul(self.b_m, self.U_aprox)
 
-        return 'WRLS', self.u, self.y, self.y_m_aprox, self.b_, self.b, self.b_wzorzec, None
+        return Wynik('WRLS', self.u, self.y, self.y_m_aprox, self.b_, self.b, self.b_wzorzec, y_m=self.y_m)
+
+
+class RLSStrumieniowy:
+    # RLS z zapominaniem dla danych napływających na bieżąco - stan O(p^2), opcjonalny bufor cykliczny trajektorii
+
+    def __init__(self, stopien, alfa, b_0=None, wsp_zap=1.0, bufor=None):
+        self.stopien = stopien
+        self.wsp_zap = wsp_zap
+        self.P = alfa * np.eye(stopien + 1)
+        self.b_m = np.zeros(stopien + 1) if b_0 is None else np.array(b_0, dtype=float).reshape(stopien + 1)
+        self.potegi = np.arange(stopien, -1, -1)
+        self.n = 0                             # liczba przetworzonych próbek
+        self.bufor = None if not bufor else np.zeros((bufor, stopien + 1))
+
+    def update(self, u, y):
+        fi = float(u) ** self.potegi
+        Pu = self.P @ fi
+        mian = fi @ Pu + self.wsp_zap
+        self.b_m = self.b_m + Pu * ((y - fi @ self.b_m) / mian)
+        self.P = (self.P - np.outer(Pu, Pu) / mian) / self.wsp_zap
+        if self.bufor is not None:
+            self.bufor[self.n % len(self.bufor)] = self.b_m
+        self.n += 1
+        return self.b_m
+
+    def update_batch(self, us, ys):
+        us = np.asarray(us, dtype=float)
+        ile = len(us)
+        if not ile:
+            return self.b_m
+        # kolumna 0 przechowuje bieżący stan - jądro rls zaczyna od próbki 1
+        U = np.zeros((self.stopien + 1, ile + 1))
+        U[:, 1:] = macierz_wejsc(us, self.stopien)
+        y = np.concatenate(([0.0], np.asarray(ys, dtype=float)))
+        b_ = np.zeros((self.stopien + 1, ile + 1))
+        b_[:, 0] = self.b_m
+        self.P = rls(U, y, self.P, b_, 1, self.wsp_zap)
+        self.b_m = b_[:, -1].copy()
+
+        if self.bufor is not None:
+            dl = len(self.bufor)
+            ostatnie = b_[:, max(1, ile + 1 - dl):].T
+            indeksy = (self.n + ile - len(ostatnie) + np.arange(len(ostatnie))) % dl
+            self.bufor[indeksy] = ostatnie
+        self.n += ile
+        return self.b_m
+
+    def przetworz(self, strumien, paczka=1024):
+        # strumien - dowolny iterowalny obiekt par (u, y), np. generator czytający z gniazda
+        us, ys = [], []
+        for u, y in strumien:
+            us.append(u)
+            ys.append(y)
+            if len(us) == paczka:
+                self.update_batch(us, ys)
+                us, ys = [], []
+        return self.update_batch(us, ys)
+
+    def historia(self):
+        # zapisane estymaty w kolejności chronologicznej (najwyżej rozmiar bufora ostatnich próbek)
+        if self.bufor is None:
+            return None
+        dl = len(self.bufor)
+        if self.n <= dl:
+            return self.bufor[:self.n].copy()
+        return np.roll(self.bufor, -(self.n % dl), axis=0)
 
 
 class GLS(Parametry):
@@ -325,70 +775,59 @@ class GLS(Parametry):
         else:
             self.korel = 'nieskorelowane'
 
-        self.macierz = np.diag(np.ones(self.N))
-        for sublst in przek_wart:
-            self.macierz += sublst[1] * np.diag(np.ones(self.N - sublst[0]), k=sublst[0])
-            self.macierz += sublst[1] * np.diag(np.ones(self.N - sublst[0]), k=-sublst[0])
+        self.pasma = macierz_pasmowa(self.N, przek_wart)
+        self.postep = None
 
     def calc(self):
-        self.zaklocenie = np.random.default_rng().multivariate_normal(np.zeros(len(self.macierz), ), self.sigma * self.macierz, method='cholesky').flatten()
-
-        self.u = np.linspace(self.range_min, self.range_max, self.N)  # wektor wejść
-        self.U = np.zeros((self.stopien + 1, self.N))  # macierz wejść - inicjalizacja
-        self.U_m = np.zeros((self.stopien_m + 1, self.N))
+        self.zaklocenie = zaklocenie_skorelowane(self.N, self.przek_wart, self.od_std)
 
-        for st in range(self.stopien + 1):
-            self.U[-st - 1] = self.u ** st  # macierz wejść - konstrukcja
-
-        for st in range(self.stopien_m + 1):
-            self.U_m[-st - 1] = self.u ** st  # macierz wejść - konstrukcja
+        self.macierze_wejsc()
 
         self.y_wzorzec = np.matmul(self.b, self.U)
         self.y = self.y_wzorzec + self.zaklocenie
-
-        self.u_aprox = np.linspace(self.range_min, self.range_max, 1000)
-        self.U_aprox = np.zeros((self.stopien_m + 1, 1000))
-
-        for st in range(self.stopien_m + 1):
-            self.U_aprox[-st - 1] = self.u_aprox ** st  # macierz wejść - konstrukcja
+        zglos(self.postep, 0.4)
 
         if self.algorytm == 'GLS':
-            self.b_m = np.linalg.inv(self.U_m @ np.linalg.inv(self.macierz) @ self.U_m.T) @ self.U_m @ np.linalg.inv(
-                self.macierz) @ self.y
+            czynnik = czynnik_pasmowy(self.N, klucz_pasm(self.przek_wart))
+            wybielone = wybiel(czynnik, np.column_stack((self.U_m.T, self.y)))
+            zglos(self.postep, 0.8)
+            self.b_m, odwr, self.uwarunkowanie = rozwiaz_mnk(wybielone[:, :-1].T, wybielone[:, -1])
 
             self.y_m = self.b_m @ self.U_m
 
             self.y_m_aprox = self.b_m @ self.U_aprox
 
-            self.cov = self.sigma * np.linalg.inv(self.U_m @ np.linalg.inv(self.macierz) @ self.U_m.T)
+            self.cov = self.sigma * odwr
 
             if self.stopien < self.stopien_m:
                 self.b = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b))
             else:
                 self.b_m = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b_m))
 
-            return 'GLS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.cov
+            return Wynik('GLS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.cov, self.uwarunkowanie,
+                         self.y_m)
 
         elif self.algorytm == 'LS':
-            self.b_m = np.linalg.inv(self.U_m @ self.U_m.T) @ self.U_m @ self.y
+            self.b_m, odwr, self.uwarunkowanie = rozwiaz_mnk(self.U_m, self.y)
             self.y_m = self.b_m @ self.U_m
 
             self.y_m_aprox = self.b_m @ self.U_aprox
 
-            self.cov = self.sigma * np.linalg.inv(self.U_m @ self.U_m.T) @ self.U_m @ self.macierz @ self.U_m.T @ np.linalg.inv(self.U_m @ self.U_m.T)
+            self.cov = partial(_cov_ls_skorelowane, self.sigma, odwr, self.U_m, self.pasma)     # liczona przy odczycie
 
             if self.stopien < self.stopien_m:
                 self.b = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b))
             else:
                 self.b_m = np.hstack((np.zeros((abs(self.stopien - self.stopien_m),)), self.b_m))
 
-            return 'GLS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.cov
+            return Wynik('GLS', self.u, self.y, self.y_m_aprox, self.b_m, self.b, None, self.cov, self.uwarunkowanie,
+                         self.y_m)
 
     def check(self):
         try:
-            np.linalg.cholesky(self.macierz)
+            linalg.cholesky_banded(self.pasma)
             return True
-        except:
+        except linalg.LinAlgError:
             return False
 
     def positive_matrix(self):
@@ -401,17 +840,170 @@ class GLS(Parametry):
                     diff = self.przek_wart[i][1] / 2
                     self.przek_wart[i][1] -= diff
 
-                self.macierz -= diff * np.diag(np.ones(self.N - sublst[0]), k=sublst[0])
-                self.macierz -= diff * np.diag(np.ones(self.N - sublst[0]), k=-sublst[0])
+                self.pasma[-1 - sublst[0], sublst[0]:] -= diff
         return self.przek_wart[:]
 
 
+def model_nieliniowy(typ, b, u):
+    match typ:
+        case 'sinus':
+            return b[0] * np.sin(2 * np.pi / b[1] * u + np.pi * b[2]) + b[3]
+        case 'sinus_2':
+            return b[0] * np.sin(2 * np.pi / b[1] * u + np.pi * b[2]) + \
+                   b[3] * np.sin(2 * np.pi / b[4] * u + np.pi * b[5]) + b[6]
+        case 'exp':
+            return b[0] * np.exp(-1 * u / b[1]) + b[2]
+
+
+def jakobian_nieliniowy(typ, b, u, F):
+    # wypełnia w miejscu macierz F (N x p) pochodnych modelu po parametrach
+    match typ:
+        case 'sinus' | 'sinus_2':
+            for j in range(0, len(b) - 1, 3):
+                kat = 2 * np.pi / b[j + 1] * u + np.pi * b[j + 2]
+                np.sin(kat, out=F[:, j])
+                np.cos(kat, out=F[:, j + 2])
+                F[:, j + 2] *= b[j]
+                np.multiply(F[:, j + 2], -2 * np.pi * u / b[j + 1] ** 2, out=F[:, j + 1])
+                F[:, j + 2] *= np.pi
+        case 'exp':
+            np.exp(-1 * u / b[1], out=F[:, 0])
+            np.multiply(F[:, 0], b[0] * u / b[1] ** 2, out=F[:, 1])
+    F[:, -1] = 1
+
+
+def gauss_newton(typ, u, y, b_0, iter, tol=1e-10, tlumienie=1e-3, postep=None):
+    # Gauss-Newton z tłumieniem Levenberga-Marquardta, krok z rozkładu QR (lstsq) układu rozszerzonego
+    # zwraca trajektorię parametrów (p x liczba iteracji + 1) i wartości funkcji kosztu w kolejnych iteracjach
+    N, p = len(u), len(b_0)
+    A = np.zeros((N + p, p))                  # [F; sqrt(tlumienie) * D]
+    r = np.zeros(N + p)
+    F = A[:N]
+
+    b = np.array(b_0, dtype=float)
+    e = y - model_nieliniowy(typ, b, u)
+    koszt = [e @ e]
+    b_ = [b]
+
+    for nr in range(iter):
+        zglos(postep, nr / iter)
+        jakobian_nieliniowy(typ, b, u, F)
+        A[N:] = np.diag(np.sqrt(tlumienie) * np.linalg.norm(F, axis=0))
+        r[:N] = e
+        krok = np.linalg.lstsq(A, r, rcond=None)[0]
+
+        b_nowe = b + krok
+        e_nowe = y - model_nieliniowy(typ, b_nowe, u)
+        koszt_nowy = e_nowe @ e_nowe
+        if np.isfinite(koszt_nowy) and koszt_nowy <= koszt[-1]:
+            zmiana = koszt[-1] - koszt_nowy
+            b, e = b_nowe, e_nowe
+            tlumienie /= 10
+            koszt.append(koszt_nowy)
+            b_.append(b)
+            if np.linalg.norm(krok) <= tol * (np.linalg.norm(b) + tol) or zmiana <= tol * koszt_nowy:
+                break
+        else:
+            tlumienie *= 10
+            koszt.append(koszt[-1])
+            b_.append(b)
+
+    return np.array(b_).T, np.array(koszt)
+
+
+def estymuj_start(typ, u, y):
+    # wartości początkowe dla modeli sinusoidalnych: okresy z maksimów periodogramu (FFT dla siatki równomiernej,
+    # Lomb-Scargle dla nierównomiernej), amplitudy, fazy i składowa stała z liniowego LS przy ustalonych okresach
+    if typ not in ('sinus', 'sinus_2'):
+        raise ValueError('Automatyczny dobór wartości początkowych dostępny jest tylko dla modeli sinusoidalnych')
+    skladowe = 1 if typ == 'sinus' else 2
+    u = np.asarray(u, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(u) < 2 * skladowe + 2 or np.ptp(u) == 0:
+        raise ValueError(f'Za mało próbek do wyznaczenia wartości początkowych modelu {typ}')
+    yc = y - y.mean()
+    if np.max(np.abs(yc)) <= 1e-12 * max(1.0, np.max(np.abs(y))):
+        raise ValueError(f'Odpowiedź nie ma składowej zmiennej - brak okresów do wyznaczenia dla modelu {typ}')
+
+    krok = np.diff(u)
+    if np.allclose(krok, krok[0]):
+        n = 4 * len(u)                     # uzupełnienie zerami - gęstsza siatka częstotliwości
+        widmo = np.abs(np.fft.rfft(yc * np.hanning(len(u)), n))     # okno Hanna - niskie listki boczne
+        czest = 2 * np.pi * np.fft.rfftfreq(n, krok[0])
+    else:
+        czest = np.linspace(np.pi / np.ptp(u), np.pi / np.median(np.abs(krok)), 4 * len(u))
+        widmo = signal.lombscargle(u, yc, czest)
+    widmo[czest == 0] = 0
+
+    # maksima od największego; pomijane listki boczne wybranych już składowych (w odległości mniejszej
+    # niż dwukrotna rozdzielczość częstotliwościowa 2 pi / długość przedziału) i maksima poniżej 1% największego
+    szczyty = signal.find_peaks(widmo, height=0.01 * np.max(widmo))[0]
+    rozdzielczosc = 2 * np.pi / np.ptp(u)
+    omegi = []
+    for om in czest[szczyty[np.argsort(widmo[szczyty])[::-1]]]:
+        if all(abs(om - wybrana) > 2 * rozdzielczosc for wybrana in omegi):
+            omegi.append(om)
+            if len(omegi) == skladowe:
+                break
+    if len(omegi) < skladowe:
+        raise ValueError(f'W widmie odpowiedzi nie znaleziono {skladowe} składowych okresowych modelu {typ} - '
+                         f'podaj wartości początkowe ręcznie')
+
+    X = np.column_stack([f(om * u) for om in omegi for f in (np.sin, np.cos)] + [np.ones_like(u)])
+    wsp = np.linalg.lstsq(X, y, rcond=None)[0]
+
+    b_0 = []
+    for k, om in enumerate(omegi):
+        a, c = wsp[2 * k], wsp[2 * k + 1]     # a sin + c cos = amp sin(kąt + faza)
+        b_0 += [np.hypot(a, c), 2 * np.pi / om, (np.arctan2(c, a) / np.pi) % 2]
+    return b_0 + [wsp[-1]]
+
+
+def _dopasuj(zadanie):
+    return gauss_newton(*zadanie)
+
+
+def wielostart(typ, u, y, b_0, iter, starty=64, najlepsze=8, rozrzut=0.5, tol=1e-10, procesy=None, postep=None):
+    # punkty startowe z ciągu Haltona w otoczeniu b_0, koszt wszystkich startów liczony jednocześnie (starty x N),
+    # Gauss-Newton uruchamiany tylko z najlepszych punktów; zwraca listę (koszt, b, trajektoria, koszty) od najlepszego
+    b_0 = np.asarray(b_0, dtype=float)
+    szer = rozrzut * np.maximum(np.abs(b_0), 1.0)
+    punkty = qmc.Halton(d=len(b_0), seed=np.random.randint(2 ** 31)).random(starty)
+    B = b_0 + szer * (2 * punkty - 1)
+    B[0] = b_0
+
+    with np.errstate(all='ignore'):
+        E = y - model_nieliniowy(typ, B.T[:, :, None], u)
+        koszt = np.einsum('ij,ij->i', E, E)
+    koszt[~np.isfinite(koszt)] = np.inf
+
+    zadania = [(typ, u, y, B[i], iter, tol) for i in np.argsort(koszt)[:najlepsze]]
+    wyniki = []
+    if procesy and procesy > 1:
+        with ProcessPoolExecutor(max_workers=procesy) as pula:
+            for wynik in pula.map(_dopasuj, zadania):
+                wyniki.append(wynik)
+                zglos(postep, len(wyniki) / len(zadania))
+    else:
+        for zadanie in zadania:
+            wyniki.append(_dopasuj(zadanie))
+            zglos(postep, len(wyniki) / len(zadania))
+
+    ranking = [(float(k[-1]) if np.isfinite(k[-1]) else np.inf, b_[:, -1], b_, k) for b_, k in wyniki]
+    return sorted(ranking, key=lambda wpis: wpis[0])
+
+
 class NLS(ParametryNieliniowy):
-    def __init__(self, obkt, param, iter, *args):
+    def __init__(self, obkt, param, iter, *args, tol=1e-10, wielostart=0, procesy=None):
         super().__init__(obkt, param.N, param.range_min, param.range_max, param.od_std)
         self.iter = iter
+        self.tol = tol
+        self.wielostart = wielostart      # liczba punktów startowych, 0 - pojedynczy start z podanych wartości
+        self.procesy = procesy
         self.ob_param = param
-        match obkt.typ:
+        self.start_auto = not args          # brak wartości początkowych - dobór na podstawie periodogramu
+        self.postep = None
+        match obkt.typ if args else None:
             case 'sinus':
                 self.amp_0, self.T_0, self.przes_0, self.skl_st_0 = args
             case 'sinus_2':
@@ -425,67 +1017,44 @@ class NLS(ParametryNieliniowy):
 
         match self.typ:
             case 'sinus':
-                self.b_ = np.hstack((np.array([self.amp_0, self.T_0, self.przes_0, self.skl_st_0]).reshape(4, 1), np.zeros((4, self.iter))))
-
-                self.F = np.zeros((self.N, 4))
-
-                for i in range(self.iter):
-                    self.F = np.hstack(((np.sin(2 * np.pi / self.b_[1, i] * self.u + np.pi * self.b_[2, i]).reshape(self.N, 1)),
-                                        (-2 * np.pi * self.b_[0, i] * self.u * np.cos(self.b_[2, i] + 2 * np.pi * self.u / self.b_[1, i]) / self.b_[1, i] ** 2).reshape(self.N,1),
-                                        (self.b_[0, i] * np.cos(self.b_[2, i] + 2 * np.pi * self.u / self.b_[1, i])).reshape(self.N,1),
-                                        np.ones((self.N, 1))))
-                    self.b_[:, i + 1] = self.b_[:, i] + (np.linalg.inv(self.F.T @ self.F) @ self.F.T @ (self.y - (self.b_[0, i] * np.sin(2 * np.pi / self.b_[1, i] * (self.u + self.b_[2, i])) + self.b_[3, i])))
-
-                self.y_aprox = self.b_[0, self.iter] * np.sin(2 * np.pi / self.b_[1, self.iter] * (np.linspace(self.range_min, self.range_max, 1000) + self.b_[2, self.iter])) + self.b_[3, self.iter]
-
-                return 'NLS', self.u, self.y, self.y_aprox, self.b_[:, -1], \
-                    np.array([self.amp, self.T, self.przes, self.skl_st]), None, None
-
+                b = np.array([self.amp, self.T, self.przes, self.skl_st])
             case 'sinus_2':
-                self.b_ = np.hstack((np.array([self.amp1_0, self.T1_0, self.przes1_0, self.amp2_0, self.T2_0, self.przes2_0, self.skl_st_0]).reshape(7, 1), np.zeros((7, self.iter))))
-
-                self.F = np.zeros((self.N, 7))
-
-                for i in range(self.iter):
-                    self.F = np.hstack(((np.sin(2 * np.pi / self.b_[1, i] * self.u + np.pi * self.b_[2, i]).reshape(self.N, 1)),
-                                        (-2 * np.pi * self.b_[0, i] * self.u * np.cos(self.b_[2, i] + 2 * np.pi * self.u / self.b_[1, i]) / self.b_[1, i] ** 2).reshape(self.N,1),
-                                        (self.b_[0, i] * np.cos(self.b_[2, i] + 2 * np.pi * self.u / self.b_[1, i])).reshape(self.N,1),
-                                        (np.sin(2 * np.pi / self.b_[4, i] * self.u + np.pi * self.b_[5, i]).reshape(self.N, 1)),
-                                        (-2 * np.pi * self.b_[3, i] * self.u * np.cos(self.b_[5, i] + 2 * np.pi * self.u / self.b_[4, i]) / self.b_[4, i] ** 2).reshape(self.N, 1),
-                                        (self.b_[3, i] * np.cos(self.b_[5, i] + 2 * np.pi * self.u / self.b_[4, i])).reshape(self.N, 1),
-                                        np.ones((self.N, 1))))
-                    self.b_[:, i + 1] = self.b_[:, i] + (np.linalg.inv(self.F.T @ self.F) @ self.F.T @ (self.y - (self.b_[0, i] * np.sin(2 * np.pi / self.b_[1, i] * (self.u + self.b_[2, i])) + self.b_[3, i] * np.sin(2 * np.pi / self.b_[4, i] * (self.u + self.b_[5, i])) + self.b_[6, i])))
-
-                self.y_aprox = self.b_[0, self.iter] * np.sin(2 * np.pi / self.b_[1, self.iter] * (np.linspace(self.range_min, self.range_max, 1000) + self.b_[2, self.iter])) + self.b_[3, self.iter] * np.sin(2 * np.pi / self.b_[4, self.iter] * (np.linspace(self.range_min, self.range_max, 1000) + self.b_[5, self.iter])) + self.b_[6, self.iter]
-
-                return 'NLS', self.u, self.y, self.y_aprox, self.b_[:, -1], \
-                    np.array([self.amp1, self.T1, self.przes1, self.amp2, self.T2, self.przes2, self.skl_st]), None, None
-
+                b = np.array([self.amp1, self.T1, self.przes1, self.amp2, self.T2, self.przes2, self.skl_st])
             case 'exp':
-                self.b_ = np.hstack((np.array([self.amp_0, self.st_czas_0, self.skl_st_0]).reshape(3, 1), np.zeros((3, self.iter))))
+                b = np.array([self.amp, self.st_czas, self.skl_st])
 
-                self.F = np.zeros((self.N, 7))
+        match self.typ if not self.start_auto else None:
+            case 'sinus':
+                b_0 = [self.amp_0, self.T_0, self.przes_0, self.skl_st_0]
+            case 'sinus_2':
+                b_0 = [self.amp1_0, self.T1_0, self.przes1_0, self.amp2_0, self.T2_0, self.przes2_0, self.skl_st_0]
+            case 'exp':
+                b_0 = [self.amp_0, self.st_czas_0, self.skl_st_0]
+            case None:
+                b_0 = estymuj_start(self.typ, self.u, self.y)
+
+        if self.wielostart:
+            self.ranking = wielostart(self.typ, self.u, self.y, b_0, self.iter, self.wielostart, tol=self.tol,
+                                      procesy=self.procesy, postep=self.postep)
+            self.b_, self.koszt = self.ranking[0][2], self.ranking[0][3]
+        else:
+            self.b_, self.koszt = gauss_newton(self.typ, self.u, self.y, b_0, self.iter, self.tol, postep=self.postep)
+        self.iteracje = self.b_.shape[1] - 1
 
-                for i in range(self.iter):
-                    self.F = np.hstack(((np.exp(-1 * self.u / self.b_[1, i])).reshape(self.N, 1),
-                                        (self.b_[0, i] * self.u * np.exp(-1 * self.u / self.b_[1, i]) / self.b_[1, i] ** 2).reshape(self.N, 1),
-                                        np.ones((self.N, 1))))
-                    self.b_[:, i + 1] = self.b_[:, i] + (np.linalg.inv(self.F.T @ self.F) @ self.F.T @ (self.y - (self.b_[0, i] * np.exp((-1) * self.u / self.b_[1, i]) + self.b_[2, i])))
+        self.y_aprox = model_nieliniowy(self.typ, self.b_[:, -1], np.linspace(self.range_min, self.range_max, 1000))
 
-                self.y_aprox = self.b_[0, self.iter] * np.exp((-1) * np.linspace(self.range_min, self.range_max, 1000) / self.b_[1, self.iter]) + self.b_[2, self.iter]
-                return 'NLS', self.u, self.y, self.y_aprox, self.b_[:, -1], \
-                    np.array([self.amp, self.st_czas, self.skl_st]), None, None
+        return Wynik('NLS', self.u, self.y, self.y_aprox, self.b_[:, -1], b,
+                     y_m=model_nieliniowy(self.typ, self.b_[:, -1], self.u))
 
 
 class Korel(ParametryDynamiczny):
-    def __init__(self, obkt, param):
+    def __init__(self, obkt, param, korelacja='fft'):
         super().__init__(obkt, param.N, param.range_max, param.od_std_w, param.od_std)
+        self.korelacja = korelacja          # 'fft' lub 'petla' (wersja referencyjna)
+        self.symulacja = param.symulacja
+        self.postep = None
 
-    def calc(self):
-        super().calc()
-        self.nmax = int(0.1 * self.N)
-        self.tau = np.arange(0, 0.1 * self.range_max, self.dt)
-
+    def korelacje_petla(self):
         self.Ruu = np.zeros(self.nmax)
         self.Ryu = np.zeros(self.nmax)
         self.Ruy = np.zeros(self.nmax)
@@ -499,15 +1068,42 @@ class Korel(ParametryDynamiczny):
             self.Ruu[m - 1] *= self.dt / (self.N - m)
             self.Ryu[m - 1] *= self.dt / (self.N - m)
             self.Ruy[m - 1] *= self.dt / (self.N - m)
+            zglos(self.postep, 0.3 + 0.5 * m / self.nmax)
+
+    def korelacje_fft(self):
+        # te same sumy co w korelacje_petla (bez ostatniego iloczynu dla każdego przesunięcia), w O(N log N)
+        przes = np.arange(self.nmax)
+        norma = self.dt / (self.N - 1 - przes)
+
+        def korelacja(a, b):
+            # suma po ii z b[ii] * a[ii + m]
+            pelna = signal.correlate(a, b, mode='full', method='fft')[self.N - 1:self.N - 1 + self.nmax]
+            return (pelna - b[self.N - 1 - przes] * a[self.N - 1]) * norma
+
+        self.Ruu = korelacja(self.u, self.u)
+        self.Ryu = korelacja(self.u, self.y)
+        self.Ruy = korelacja(self.y, self.u)
+
+    def calc(self):
+        super().calc()
+        zglos(self.postep, 0.3)
+        return self.identyfikuj()
+
+    def identyfikuj(self):
+        self.nmax = int(0.1 * self.N)
+        self.tau = self.dt * np.arange(self.nmax)     # dokładnie nmax przesunięć - tyle co korelacje i estymata k
+
+        if self.korelacja == 'petla':
+            self.korelacje_petla()
+        else:
+            self.korelacje_fft()
+        zglos(self.postep, 0.8)
 
         self.Tau = np.concatenate((-self.tau[:0:-1], self.tau))
         self.RUU = np.concatenate((self.Ruu[:0:-1], self.Ruu))
         self.RYU = np.concatenate((self.Ryu[:0:-1], self.Ruy))
 
-        self.Rwl = self.RUU[:self.nmax].reshape((self.nmax, 1))
-        for ii in range(1, self.nmax):
-            self.Rwl = np.hstack((self.RUU[ii:ii + self.nmax].reshape((self.nmax, 1)), self.Rwl))
-
-        self.k = self.Ruy @ np.linalg.inv(self.Rwl) / self.dt
+        # macierz autokorelacji jest symetryczna Toeplitza o pierwszej kolumnie Ruu - rozwiązanie algorytmem Levinsona
+        self.k = linalg.solve_toeplitz(self.Ruu, self.Ruy) / self.dt
         _, self.kwzr = signal.impulse(self.G, T=self.tau)
-        return 'korelacyjny', self.tau, self.kwzr, self.k, None, self.wsp, None, None
+        return Wynik('korelacyjny', self.tau, self.kwzr, self.k, None, self.wsp)
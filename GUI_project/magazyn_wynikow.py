@@ -0,0 +1,115 @@
+'''
+GUI Algorithm Simulation
+MIT License
+Copyright (c) 2024 Artur Mazurkiewicz
+'''
+
+
+
+import json
+from datetime import datetime
+from os import path, makedirs, remove, listdir, rmdir
+
+import numpy as np
+
+from identyfikacja_ust import Wynik
+
+
+# Struktura katalogu magazynu:
+#     magazyn.json              - metadane przebiegów (metoda, kształty tablic, wartości skalarne, opis)
+#     <nazwa>/<pole>.npy        - sygnały i trajektorie, otwierane leniwie jako memmap tylko do odczytu
+
+
+def mapa_pliku(tablica):
+    # memmap, na który wskazuje tablica (także widok utworzony np. przez np.asarray), None dla tablic w RAM
+    while tablica is not None:
+        if isinstance(tablica, np.memmap):
+            return tablica
+        tablica = getattr(tablica, 'base', None)
+    return None
+
+
+class MagazynWynikow:
+
+    def __init__(self, katalog):
+        self.katalog = katalog
+        makedirs(katalog, exist_ok=True)
+        self.plik_indeksu = path.join(katalog, 'magazyn.json')
+        if path.exists(self.plik_indeksu):
+            with open(self.plik_indeksu, encoding='utf-8') as f:
+                self.indeks = json.load(f)
+        else:
+            self.indeks = {}
+
+    def zapisz_indeks(self):
+        with open(self.plik_indeksu, 'w', encoding='utf-8') as f:
+            json.dump(self.indeks, f, ensure_ascii=False, indent=2)
+
+    def sciezka(self, nazwa, pole):
+        return path.join(self.katalog, nazwa, f'{pole}.npy')
+
+    def nowa_nazwa(self, metoda_typ):
+        nr = 0
+        while f'{metoda_typ}_{nr}' in self.indeks:
+            nr += 1
+        return f'{metoda_typ}_{nr}'
+
+    def bufor(self, nazwa, pole, ksztalt):
+        # plik .npy otwarty do zapisu - np. trajektoria RLS zapisywana bezpośrednio na dysk w trakcie obliczeń
+        makedirs(path.join(self.katalog, nazwa), exist_ok=True)
+        return np.lib.format.open_memmap(self.sciezka(nazwa, pole), mode='w+', dtype=np.float64, shape=tuple(ksztalt))
+
+    def zapisz(self, wynik, nazwa=None, dodatkowe=None, **opis):
+        # dodatkowe - inne tablice przebiegu, np. {'trajektoria': rls.b_}
+        nazwa = nazwa or self.nowa_nazwa(wynik.metoda_typ)
+        makedirs(path.join(self.katalog, nazwa), exist_ok=True)
+
+        pola = {pole: getattr(wynik, pole) for pole in Wynik.POLA[1:] + ('y_m',)}
+        pola.update(dodatkowe or {})
+        tablice = {}
+        wartosci = {}
+        for pole, wart in pola.items():
+            if isinstance(wart, np.ndarray) and wart.ndim:
+                plik = self.sciezka(nazwa, pole)
+                mapa = mapa_pliku(wart)
+                if mapa is not None and mapa.filename and path.abspath(mapa.filename) == path.abspath(plik):
+                    mapa.flush()                # bufor z tego magazynu - dane już są na dysku
+                else:
+                    np.save(plik, wart)
+                tablice[pole] = list(wart.shape)
+            elif wart is not None:
+                wartosci[pole] = wart.tolist() if isinstance(wart, np.generic | np.ndarray) else wart
+
+        self.indeks[nazwa] = {'metoda': wynik.metoda_typ, 'tablice': tablice, 'wartosci': wartosci, 'opis': opis,
+                              'data': datetime.now().isoformat(timespec='seconds')}
+        self.zapisz_indeks()
+        return nazwa
+
+    def wczytaj(self, nazwa):
+        # tablice mapowane w pamięć - dane czytane z dysku dopiero przy dostępie do fragmentu
+        wpis = self.indeks[nazwa]
+        pola = dict(wpis['wartosci'])
+        for pole in wpis['tablice']:
+            pola[pole] = self.tablica(nazwa, pole)
+        return Wynik(wpis['metoda'], **{pole: pola.get(pole) for pole in Wynik.POLA[1:] + ('y_m',)})
+
+    def tablica(self, nazwa, pole):
+        return np.load(self.sciezka(nazwa, pole), mmap_mode='r')
+
+    def usun(self, nazwa):
+        katalog = path.join(self.katalog, nazwa)
+        if path.isdir(katalog):
+            for plik in listdir(katalog):
+                remove(path.join(katalog, plik))
+            rmdir(katalog)
+        del self.indeks[nazwa]
+        self.zapisz_indeks()
+
+    def __iter__(self):
+        return iter(self.indeks)
+
+    def __len__(self):
+        return len(self.indeks)
+
+    def __contains__(self, nazwa):
+        return nazwa in self.indeks
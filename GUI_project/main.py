@@ -5,23 +5,51 @@ Copyright (c) 2024 Artur Mazurkiewicz
 '''
 
 
+from time import perf_counter
+START = perf_counter()          # początek wczytywania programu, do raportu czasu uruchamiania (--czas-startu)
+
+import gc
+from importlib import import_module
+from threading import Thread, Lock
 import numpy as np
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, \
                               QAbstractItemView, QWidget, QStackedWidget, QPushButton, QLabel, QLineEdit, QSpacerItem, \
-                              QSizePolicy, QGraphicsOpacityEffect, QCheckBox, QScrollArea
-from sys import argv, exit
+                              QSizePolicy, QGraphicsOpacityEffect, QCheckBox, QScrollArea, QFileDialog, QProgressDialog
+import sys
+from sys import argv, exit, executable
+from datetime import datetime
 from os import path
+from tempfile import TemporaryDirectory, gettempdir
 from PySide6.QtGui import QFont, QImage, QPixmap, QColor, QIcon
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, QSize
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize, QObject, QRunnable, QThreadPool, Signal, QTimer
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
 from matplotlib.figure import Figure
 from matplotlib import pyplot as plt
 from matplotlib.animation import FuncAnimation
 
-import identyfikacja_ust as ust
+from decymacja import Decymacja
+
+
+class ModulLeniwy:
+    # moduł wczytywany przy pierwszym odwołaniu do atrybutu - import scipy (większość czasu uruchamiania)
+    # nie opóźnia pokazania okna; import_module czeka na ewentualne wczytywanie w wątku tła
+    def __init__(self, nazwa):
+        self.nazwa = nazwa
 
+    def __getattr__(self, atrybut):
+        return getattr(import_module(self.nazwa), atrybut)
+
+
+ust = ModulLeniwy('identyfikacja_ust')
+magazyn_wynikow = ModulLeniwy('magazyn_wynikow')
 
 basedir = path.dirname(__file__)
+BLOKADA_RAPORTU = Lock()        # raport startu zapisywany z wątku interfejsu i wątku wczytującego obliczenia
+
+CZAS_ANIMACJI = 1.5             # s - czas rysowania punktów pomiarowych, niezależnie od ich liczby
+CZAS_ANIMACJI_MODELU = 0.75     # s - czas rysowania odpowiedzi modelu
+PROG_BEZ_ANIMACJI = 200000      # powyżej tej liczby punktów wykres rysowany od razu, bez animacji
+HISTORIA_WYKRESOW = 4           # liczba ostatnio oglądanych wyników, dla których wykresy są trzymane w pamięci
 
 plt.style.use('seaborn-v0_8')
 plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
@@ -428,6 +456,45 @@ class BladWidget(QWidget):
         self.okno.setGraphicsEffect(opacity_effect)
         self.parent().setCurrentWidget(self.okno)
 
+
+class SygnalyObliczen(QObject):
+    postep = Signal(int)
+    gotowe = Signal(object)
+    blad = Signal(object)
+    przerwano = Signal()
+
+
+class ZadanieObliczen(QRunnable):
+    # metoda.calc() w wątku puli - wynik, błąd lub przerwanie przekazywane sygnałami do wątku interfejsu
+
+    def __init__(self, metoda):
+        super().__init__()
+        self.metoda = metoda
+        self.sygnaly = SygnalyObliczen()
+        self.anulowane = False
+        self.metoda.postep = self.zglos
+
+    def zglos(self, ulamek):
+        if self.anulowane:
+            raise ust.PrzerwanoObliczenia()
+        self.sygnaly.postep.emit(int(100 * ulamek))
+
+    def anuluj(self):
+        self.anulowane = True
+
+    def run(self):
+        try:
+            wynik = self.metoda.calc()
+        except ust.PrzerwanoObliczenia:
+            self.sygnaly.przerwano.emit()
+        except Exception as e:
+            self.sygnaly.blad.emit(e)
+        else:
+            self.sygnaly.gotowe.emit(wynik)
+        finally:
+            self.metoda.postep = None
+            self.metoda = None          # estymator z tablicami N-elementowymi nie jest dłużej przechowywany
+
 class WidokStacjonarny(QWidget):
 
     def __init__(self):
@@ -2969,6 +3036,13 @@ class WidokRLS(QWidget):
         self.layout_row_blad_N_pocz.addWidget(self.blad_N_pocz)
         self.layout_row_blad_N_pocz.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        self.pierwiastkowy = False
+        self.layout_check_pierw = QHBoxLayout()
+        self.check_pierw = QCheckBox("Wariant pierwiastkowy - aktualizacja czynnika macierzy P")
+        self.check_pierw.stateChanged.connect(self.check_pierw_change)
+        self.layout_check_pierw.addWidget(self.check_pierw)
+        self.layout_check_pierw.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
         self.layout_row_buttons = QHBoxLayout()
         self.layout_row_buttons.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.button_return = QPushButton("Powrót")
@@ -2986,7 +3060,9 @@ class WidokRLS(QWidget):
         self.main_layout.addLayout(self.layout_row_blad_b0)
         self.main_layout.addLayout(self.layout_row_N_pocz)
         self.main_layout.addLayout(self.layout_row_blad_N_pocz)
-        self.main_layout.addSpacing(100)
+        self.main_layout.addSpacing(40)
+        self.main_layout.addLayout(self.layout_check_pierw)
+        self.main_layout.addSpacing(60)
         self.main_layout.addLayout(self.layout_row_buttons)
         self.setLayout(self.main_layout)
 
@@ -3152,6 +3228,9 @@ class WidokRLS(QWidget):
 
 
 
+    def check_pierw_change(self, state):
+        self.pierwiastkowy = bool(state)
+
     def result(self):
         if self.button_arb.isChecked():
             alfa = float(self.pole_alfa.text())
@@ -3240,6 +3319,13 @@ class WidokRLSZap(QWidget):
         self.layout_row_blad_zap.addWidget(self.blad_zap)
         self.layout_row_blad_zap.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        self.pierwiastkowy = False
+        self.layout_check_pierw = QHBoxLayout()
+        self.check_pierw = QCheckBox("Wariant pierwiastkowy - aktualizacja czynnika macierzy P")
+        self.check_pierw.stateChanged.connect(self.check_pierw_change)
+        self.layout_check_pierw.addWidget(self.check_pierw)
+        self.layout_check_pierw.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
         self.layout_row_buttons = QHBoxLayout()
         self.layout_row_buttons.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.button_return = QPushButton("Powrót")
@@ -3257,7 +3343,9 @@ class WidokRLSZap(QWidget):
         self.main_layout.addSpacing(40)
         self.main_layout.addLayout(self.layout_row_zap)
         self.main_layout.addLayout(self.layout_row_blad_zap)
-        self.main_layout.addSpacing(100)
+        self.main_layout.addSpacing(40)
+        self.main_layout.addLayout(self.layout_check_pierw)
+        self.main_layout.addSpacing(60)
         self.main_layout.addLayout(self.layout_row_buttons)
         self.setLayout(self.main_layout)
 
@@ -3363,6 +3451,9 @@ class WidokRLSZap(QWidget):
         if not (self.blad_alfa.text() or self.blad_b0.text() or self.blad_zap.text()):
             self.button_wynik.setEnabled(True)
 
+    def check_pierw_change(self, state):
+        self.pierwiastkowy = bool(state)
+
     def result(self):
         alfa = float(self.pole_alfa.text())
         b0 = []
@@ -3829,6 +3920,17 @@ class WidokNLS(QWidget):
         self.layout_row_blad_skl.addWidget(self.blad_skl)
         self.layout_row_blad_skl.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        self.wielostart = False
+        self.layout_check_wielostart = QHBoxLayout()
+        self.check_wielostart = QCheckBox("Wielostart - przeszukanie otoczenia wartości początkowych")
+        self.check_wielostart.stateChanged.connect(self.check_wielostart_change)
+        self.layout_check_wielostart.addWidget(self.check_wielostart)
+        self.button_start = QPushButton("Wyznacz wartości początkowe")
+        self.button_start.setEnabled(False)
+        self.button_start.clicked.connect(self.wyznacz_start)
+        self.layout_check_wielostart.addWidget(self.button_start)
+        self.layout_check_wielostart.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
         self.layout_row_buttons = QHBoxLayout()
         self.layout_row_buttons.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.button_return = QPushButton("Powrót")
@@ -3849,6 +3951,7 @@ class WidokNLS(QWidget):
         self.main_layout.addLayout(self.layout_row_blad_T)
         self.main_layout.addLayout(self.layout_row_przes)
         self.main_layout.addLayout(self.layout_row_blad_przes)
+        self.main_layout.addLayout(self.layout_check_wielostart)
         self.main_layout.addLayout(self.layout_row_buttons)
         self.setLayout(self.main_layout)
 
@@ -4057,10 +4160,30 @@ class WidokNLS(QWidget):
             else:
                 self.button_wynik.setEnabled(False)
 
+    def check_wielostart_change(self, state):
+        self.wielostart = bool(state)
+
+    def wyznacz_start(self):
+        # wartości początkowe z periodogramu zmierzonej odpowiedzi
+        try:
+            b_0 = ust.estymuj_start(self.typ, self.u, self.y)
+        except ValueError as e:
+            self.blad_skl.setText(str(e))
+            return
+        match self.typ:
+            case 'sinus':
+                pola = (self.pole_amp, self.pole_T, self.pole_przes, self.pole_skl)
+            case 'sinus_2':
+                pola = (self.pole_amp, self.pole_T, self.pole_przes, self.pole_amp_2, self.pole_T_2, self.pole_przes_2,
+                        self.pole_skl)
+        for pole, wart in zip(pola, b_0):
+            pole.setText(f'{wart:.4g}')
+
     def edit_typ(self, typ):
         self.typ = typ
         match self.typ:
             case 'sinus':
+                self.button_start.setVisible(True)
                 self.pi.setVisible(True)
                 self.pi_2.setVisible(False)
                 self.napis_skl.setVisible(True)
@@ -4097,6 +4220,7 @@ class WidokNLS(QWidget):
                 self.blad_przes.setAlignment(Qt.AlignCenter | Qt.AlignCenter)
 
             case 'sinus_2':
+                self.button_start.setVisible(True)
                 self.pi.setVisible(True)
                 self.pi_2.setVisible(True)
                 self.napis_skl.setVisible(True)
@@ -4134,6 +4258,7 @@ class WidokNLS(QWidget):
                 self.blad_przes.setAlignment(Qt.AlignRight | Qt.AlignRight)
 
             case 'exp':
+                self.button_start.setVisible(False)
                 self.pi.setVisible(False)
                 self.pi_2.setVisible(False)
                 self.napis_skl.setVisible(True)
@@ -4183,6 +4308,7 @@ class WidokNLS(QWidget):
         self.ax.plot(self.u, self.y, 'o', color='#191970', markersize=3, label="Odpowiedź obiektu")
         self.ax.set_xlim(min(self.u), max(self.u))
         self.canvas.draw()
+        self.button_start.setEnabled(True)
 
 
     def result(self):
@@ -4214,9 +4340,40 @@ class WidokNLS(QWidget):
                 return iter, amp_0, st_czas_0, skl_0
 
 
+class WpisWyniku:
+    # wynik z historii: opis potrzebny do odtworzenia wykresu, bez obiektów obliczeń (tablice w metodzie i
+    # parametrach symulacji); po usunięciu wykresu z pamięci sygnały leżą w magazynie, a przycisk ma miniaturę
+    def __init__(self, obiekt, param_sym, metoda, wynik):
+        self.obiekt = obiekt
+        self.parametry = param_sym.ret()
+        self.algorytm = getattr(metoda, 'algorytm', None)
+        self.korel = getattr(metoda, 'korel', None)
+        self.wynik = wynik
+        self.nazwa = None               # nazwa w magazynie, gdy sygnały zostały zapisane
+        self.wykres = None              # WykresWidget, gdy wynik jest w historii ostatnio oglądanych
+        self.miniatura = None
+
+        self.etykieta = f"{obiekt.ret()[0]}, {self.algorytm if wynik.metoda_typ == 'GLS' else wynik.metoda_typ}"
+        self.podsumowanie = f'{self.etykieta}\nN = {len(wynik.u)}'
+        if wynik.b_m is not None or wynik.metoda_typ == 'korelacyjny':
+            # miara tylko informacyjna - niezgodny wynik nie może blokować pokazania wykresu
+            try:
+                self.podsumowanie += f'\nBłąd średniokwadratowy: {np.sqrt(np.mean(np.square(wynik.blad))):.3e}'
+            except (ValueError, TypeError):
+                pass
+
+    def ret(self):
+        return self.parametry
+
+
 class WidokWynik(QWidget):
-    def __init__(self):
+    def __init__(self, limit=HISTORIA_WYKRESOW):
         super().__init__()
+        self.limit = limit
+        self.historia = []              # wszystkie wyniki sesji (WpisWyniku)
+        self.zywe = []                  # wpisy z wykresem w pamięci, od najdawniej oglądanego
+        self.katalog_tymczasowy = TemporaryDirectory(ignore_cleanup_errors=True)
+        self.magazyn = magazyn_wynikow.MagazynWynikow(self.katalog_tymczasowy.name)
         self.layout = QVBoxLayout()
 
         self.font_l = QFont()
@@ -4270,6 +4427,11 @@ class WidokWynik(QWidget):
         self.button_return.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
         self.button_return.setStyleSheet(style)
         self.button_layout.addWidget(self.button_return)
+        self.button_zapisz = QPushButton("Zapisz")
+        self.button_zapisz.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
+        self.button_zapisz.setStyleSheet(style)
+        self.button_zapisz.clicked.connect(self.zapisz)
+        self.button_layout.addWidget(self.button_zapisz)
 
         self.boczny_layout.addLayout(self.napis_layout)
         self.boczny_layout.addLayout(self.scroll_area_layout)
@@ -4279,7 +4441,6 @@ class WidokWynik(QWidget):
 
         self.wynik_widget = QStackedWidget()
         self.wynik_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.obiekty_wynik = []
         self.buttons = []
 
         self.main_layout.addWidget(self.boczny_widget)
@@ -4292,20 +4453,62 @@ class WidokWynik(QWidget):
 
         self.setLayout(self.layout)
 
-    def rysuj_wyniki(self, obiekt, param_sym, metoda):
-        self.obiekty_wynik.append(WykresWidget(obiekt, param_sym, metoda))
-        if obiekt.typ == 'Stacjonarny' or obiekt.typ in ['sinus', 'sinus_2', 'exp']:
-            self.obiekty_wynik[-1].table()
-        self.wynik_widget.addWidget(self.obiekty_wynik[-1])
-        self.wynik_widget.setCurrentWidget(self.obiekty_wynik[-1])
-        self.update(metoda)
-
-    def update(self, met):
-        if self.obiekty_wynik[-1].metoda_typ == 'GLS':
-            self.buttons.append(QPushButton(f"{self.obiekty_wynik[-1].obiekt_typ}, {met.algorytm}"))
+    def rysuj_wyniki(self, obiekt, param_sym, metoda, wynik):
+        self.historia.append(WpisWyniku(obiekt, param_sym, metoda, wynik))
+        self.pokaz(self.historia[-1])
+        self.update(self.historia[-1])
+
+    def pokaz(self, wpis):
+        poprzedni = self.wynik_widget.currentWidget()
+        if wpis.wykres is None:
+            # odtworzenie wykresu z sygnałów zapisanych w magazynie
+            wynik = wpis.wynik if wpis.wynik is not None else self.magazyn.wczytaj(wpis.nazwa)
+            wpis.wykres = WykresWidget(wpis.obiekt, wpis, wynik)
+            if wpis.obiekt.typ == 'Stacjonarny' or wpis.obiekt.typ in ['sinus', 'sinus_2', 'exp']:
+                wpis.wykres.table()
+            self.wynik_widget.addWidget(wpis.wykres)
         else:
-            self.buttons.append(
-                QPushButton(f"{self.obiekty_wynik[-1].obiekt_typ}, {self.obiekty_wynik[-1].metoda_typ}"))
+            self.zywe.remove(wpis)
+        self.zywe.append(wpis)
+        self.wynik_widget.setCurrentWidget(wpis.wykres)
+
+        if poprzedni is not None and poprzedni is not wpis.wykres:
+            poprzedni.zatrzymaj_animacje()
+        while len(self.zywe) > self.limit:
+            self.usun_wykres(self.zywe.pop(0))
+
+    def usun_wykres(self, wpis):
+        # w pamięci zostaje tylko opis i miniatura, sygnały w magazynie (mapowane w pamięć przy odtwarzaniu)
+        wpis.wykres.zatrzymaj_animacje()
+        wpis.miniatura = wpis.wykres.canvas.grab().scaled(96, 72, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if wpis.nazwa is None:
+            wpis.nazwa = self.magazyn.zapisz(wpis.wynik)
+        wpis.wynik = None
+        przycisk = self.buttons[self.historia.index(wpis)]
+        przycisk.setIcon(QIcon(wpis.miniatura))
+        przycisk.setIconSize(wpis.miniatura.size())
+
+        self.wynik_widget.removeWidget(wpis.wykres)
+        wpis.wykres.deleteLater()
+        wpis.wykres = None
+
+    def zamknij(self):
+        # przy zamykaniu programu wykresy i tablice mapowane w pamięć zwalniane przed usunięciem katalogu
+        # tymczasowego - w Windows otwartych plików nie da się usunąć
+        for wpis in self.historia:
+            if wpis.wykres is not None:
+                wpis.wykres.zatrzymaj_animacje()
+                self.wynik_widget.removeWidget(wpis.wykres)
+                wpis.wykres.setParent(None)
+                wpis.wykres = None
+            wpis.wynik = None
+        self.zywe = []
+        gc.collect()
+        self.katalog_tymczasowy.cleanup()
+
+    def update(self, wpis):
+        self.buttons.append(QPushButton(wpis.etykieta))
+        self.buttons[-1].setToolTip(wpis.podsumowanie)
         self.buttons[-1].setStyleSheet(style)
         self.wybor_layout.addWidget(self.buttons[-1])
 
@@ -4328,7 +4531,15 @@ class WidokWynik(QWidget):
             if self.sender() is self.buttons[i]:
                 nr = i
 
-        self.wynik_widget.setCurrentWidget(self.obiekty_wynik[nr])
+        self.pokaz(self.historia[nr])
+
+    def zapisz(self):
+        # bieżący wynik do magazynu w wybranym katalogu (sygnały i trajektorie jako pliki .npy)
+        katalog = QFileDialog.getExistingDirectory(self, "Katalog magazynu wyników")
+        if not katalog or not self.historia:
+            return
+        wykres = self.wynik_widget.currentWidget()
+        magazyn_wynikow.MagazynWynikow(katalog).zapisz(wykres.wynik, obiekt=wykres.obiekt_typ, N=wykres.N)
 
 
 class WykresWidgetParametr(QWidget):
@@ -4354,10 +4565,17 @@ class WykresWidgetParametr(QWidget):
 
         self.ax = self.figure.add_subplot(111)
 
-        self.ax.plot(np.arange(0, self.N), self.b_, color='#191970', linewidth=1.2, label="Parametr obiektu")
-        self.ax.plot(np.arange(0, self.N), self.b_wzorzec, 'o', color='red', markersize=4, label="Współczynnik modelu")
+        linia, = self.ax.plot([], [], color='#191970', linewidth=1.2, label="Parametr obiektu")
+        punkty, = self.ax.plot([], [], 'o', color='red', markersize=4, label="Współczynnik modelu")
 
         self.ax.set_xlim(0, self.N-1)
+        self.ax.set_ylim(*self.zakres(self.b_, self.b_wzorzec))
+
+        # przerzedzenie do rozdzielczości osi, ponawiane przy przybliżaniu z pełnych trajektorii
+        self.dec_linia = Decymacja(linia, np.arange(0, self.N), self.b_)
+        self.dec_punkty = Decymacja(punkty, np.arange(0, self.N), self.b_wzorzec, punkty=True)
+        self.dec_linia.pokaz()
+        self.dec_punkty.pokaz()
 
         self.ax.set_xlabel('Numer pętli')
         self.ax.set_ylabel('Wartość')
@@ -4367,11 +4585,19 @@ class WykresWidgetParametr(QWidget):
         self.canvas.draw()
         self.layout = QVBoxLayout()
         self.layout.addWidget(self.canvas)
+        self.layout.addWidget(NavigationToolbar2QT(self.canvas, self))
         self.setLayout(self.layout)
 
+    @staticmethod
+    def zakres(*tablice):
+        dol = min(np.nanmin(t) for t in tablice)
+        gora = max(np.nanmax(t) for t in tablice)
+        margines = 0.05 * (gora - dol) or 0.5
+        return dol - margines, gora + margines
+
 
 class WykresWidget(QWidget):
-    def __init__(self, obiekt, param_sym, metoda):
+    def __init__(self, obiekt, wpis, wynik):
         super().__init__()
 
         self.main_layout = QVBoxLayout()
@@ -4401,31 +4627,35 @@ class WykresWidget(QWidget):
             self.obiekt_typ, self.stopien, self.b_i = obiekt.ret()
 
         if self.obiekt_typ == "Stacjonarny":
-            self.stopien_m, self.N, self.zakr_min, self.zakr_max, self.od_std = param_sym.ret()
+            self.stopien_m, self.N, self.zakr_min, self.zakr_max, self.od_std = wpis.ret()
         elif self.obiekt_typ == "Nieliniowy":
-            self.N, self.zakr_min, self.zakr_max, self.od_std = param_sym.ret()
+            self.N, self.zakr_min, self.zakr_max, self.od_std = wpis.ret()
         elif self.obiekt_typ == "Dynamiczny":
-            self.N, self.zakr_max, self.od_std_w, self.od_std = param_sym.ret()
+            self.N, self.zakr_max, self.od_std_w, self.od_std = wpis.ret()
             self.zakr_min = 0
         else:
-            self.N, self.zakr_min, self.zakr_max, self.wymuszenie_typ, self.od_std = param_sym.ret()
+            self.N, self.zakr_min, self.zakr_max, self.wymuszenie_typ, self.od_std = wpis.ret()
 
-        self.metoda_typ, self.u, self.y, self.y_m, self.b_m, self.b, self.b_wzorzec, self.cov = metoda.calc()
+        self.wynik = wynik                  # wynik policzony wcześniej w wątku obliczeń
+        self.metoda_typ = self.wynik.metoda_typ
 
         self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
-        self.wykresy.addWidget(self.canvas)
+        self.pole_wykresu = QWidget()
+        self.pole_wykresu_layout = QVBoxLayout(self.pole_wykresu)
+        self.pole_wykresu_layout.addWidget(self.canvas)
+        self.pole_wykresu_layout.addWidget(NavigationToolbar2QT(self.canvas, self.pole_wykresu))
+        self.wykresy.addWidget(self.pole_wykresu)
         self.main_layout.addWidget(self.wykresy)
-        self.wykresy.setCurrentWidget(self.canvas)
+        self.wykresy.setCurrentWidget(self.pole_wykresu)
 
         self.ax = self.figure.add_subplot(111)
 
-        self.length = len(self.u)
+        self.length = len(self.wynik.u)
 
-        self.var_zero()
-
-        self.ax.set_xlim(min(self.u), max(self.u))
-        self.ax.set_ylim(min([min(self.y), min(self.y_m)]), max([max(self.y), max(self.y_m)]))
+        self.ax.set_xlim(np.min(self.wynik.u), np.max(self.wynik.u))
+        self.ax.set_ylim(min(np.min(self.wynik.y), np.min(self.wynik.y_m_aprox)),
+                         max(np.max(self.wynik.y), np.max(self.wynik.y_m_aprox)))
 
         if self.obiekt_typ == "Dynamiczny":
             self.points, = self.ax.plot([], [], linewidth=1.2, color='#191970', label="Odpowiedź impulsowa obiektu")
@@ -4440,29 +4670,35 @@ class WykresWidget(QWidget):
 
         if self.metoda_typ == 'GLS':
             self.ax.set_title(
-                f'Obiekt {self.obiekt_typ.lower()}, algorytm {metoda.algorytm}, zakłócenia {metoda.korel}')
+                f'Obiekt {self.obiekt_typ.lower()}, algorytm {wpis.algorytm}, zakłócenia {wpis.korel}')
         else:
             self.ax.set_title(
                 f'Obiekt {self.obiekt_typ.lower()}, algorytm {self.metoda_typ}, zakłócenia nieskorelowane')
         self.ax.grid(True)
         self.ax.legend()
 
-        self.speed = 1000 / self.length
-        self.wys_elem = int(np.ceil(self.length / 1000)) ** 2
-
-        if 700 < self.length < 1300:
-            self.wys_elem = 2
-
         if self.obiekt_typ == "Dynamiczny":
             self.u_aprox = np.linspace(self.zakr_min, 0.1 * self.zakr_max, int(0.1 * self.N))
         else:
             self.u_aprox = np.linspace(self.zakr_min, self.zakr_max, 1000)
+        self.length_aprox = min(len(self.u_aprox), len(self.wynik.y_m_aprox))
+        self.pelny = False              # True - animacja przerwana, wykres od razu w całości
+
+        # przy dużym N rysowana jest tylko część próbek, wybierana ponownie po zmianie zakresu osi
+        self.dec_points = Decymacja(self.points, self.wynik.u, self.wynik.y,
+                                    punkty=self.obiekt_typ != "Dynamiczny", n=0)
+        self.dec_line = Decymacja(self.line, self.u_aprox[:self.length_aprox],
+                                  self.wynik.y_m_aprox[:self.length_aprox], n=0)
+
+        if self.length > PROG_BEZ_ANIMACJI:
+            self.update_plot(self.length)
+            self.update_plot_aprox(self.length_aprox)
+            self.canvas.draw_idle()
+        else:
+            self.anim = FuncAnimation(self.figure, self.update_plot, blit=True, interval=15, repeat=False,
+                                      frames=self.klatki(self.length, CZAS_ANIMACJI), cache_frame_data=False)
 
-        self.fr = int(self.length // self.wys_elem)
-        self.anim = FuncAnimation(self.figure, self.update_plot, blit=True, frames=self.fr,
-                                  interval=self.speed, repeat=False)
-
-        if self.b_wzorzec is None and self.b_m is not None:
+        if self.wynik.b_wzorzec is None and self.wynik.b_m is not None:
             self.table_layout = QHBoxLayout()
             self.show_button_layout = QHBoxLayout()
             self.show_button = QPushButton("▼ Ukryj tabelę z wynikami ▼")
@@ -4517,7 +4753,7 @@ class WykresWidget(QWidget):
 
             self.main_layout.addLayout(self.table_layout)
 
-            if self.cov is not None:
+            if self.wynik.cov is not None:
                 self.macierz_layout = QVBoxLayout()
                 self.macierz_cov = QTableWidget(self.stopien_m + 1, self.stopien_m + 1)
                 self.macierz_cov.setObjectName('tabela')
@@ -4529,20 +4765,26 @@ class WykresWidget(QWidget):
                 self.macierz_cov.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
                 self.macierz_layout.addWidget(self.macierz_napis, alignment=Qt.AlignCenter)
                 self.macierz_layout.addWidget(self.macierz_cov, alignment=Qt.AlignCenter)
+                self.uwarunkowanie_napis = QLabel(f'Wskaźnik uwarunkowania: {self.wynik.uwarunkowanie:.2e}'
+                                                  if self.wynik.uwarunkowanie is not None else '')
+                self.uwarunkowanie_napis.setStyleSheet(style)
+                self.uwarunkowanie_napis.setFont(self.font_)
+                self.uwarunkowanie_napis.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
+                self.macierz_layout.addWidget(self.uwarunkowanie_napis, alignment=Qt.AlignCenter)
                 self.macierz_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
                 self.table_layout.addLayout(self.macierz_layout)
                 self.macierz()
 
-        elif self.b_m is not None:
+        elif self.wynik.b_m is not None:
             self.layout_wybor_parametru = QHBoxLayout()
 
-            self.wykresy_list = [self.canvas]
+            self.wykresy_list = [self.pole_wykresu]
             self.buttons = []
 
-            for i, sublst in enumerate(self.b):
-                self.wykresy_list.append(WykresWidgetParametr(len(self.b) - i - 1, sublst, self.b_wzorzec[:, i], self.b_m[i, :]))
+            for i, sublst in enumerate(self.wynik.b):
+                self.wykresy_list.append(WykresWidgetParametr(len(self.wynik.b) - i - 1, sublst, self.wynik.b_wzorzec[:, i], self.wynik.b_m[i, :]))
                 self.wykresy.addWidget(self.wykresy_list[-1])
-                self.buttons.append(QPushButton(f'Parametr x^{len(self.b) - i - 1}'))
+                self.buttons.append(QPushButton(f'Parametr x^{len(self.wynik.b) - i - 1}'))
                 self.buttons[-1].setCheckable(True)
                 self.buttons[-1].setStyleSheet(style)
                 self.buttons[-1].setObjectName(f'{i + 1}')
@@ -4556,45 +4798,43 @@ class WykresWidget(QWidget):
             self.layout_wybor_parametru.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.main_layout.addLayout(self.layout_wybor_parametru)
 
-    def update_plot(self, frame):
-        for i in range(self.wys_elem):
-            self.var_u[self.wys_elem*frame+i] = self.u[self.wys_elem*frame+i]
-            self.var_y[self.wys_elem*frame+i] = self.y[self.wys_elem*frame+i]
+    def klatki(self, n, czas):
+        # liczba elementów widocznych w kolejnych klatkach - proporcjonalna do czasu od startu animacji,
+        # więc rysowanie kończy się po ok. czas sekund bez względu na n i szybkość rysowania
+        start = perf_counter()
+        k = 0
+        while k < n:
+            k = n if self.pelny else min(n, max(k + 1, int(n * (perf_counter() - start) / czas)))
+            yield k
 
-        self.points.set_data(self.var_u, self.var_y)
+    def update_plot(self, k):
+        # pierwsze k próbek sygnałów, przerzedzonych do rozdzielczości osi
+        self.dec_points.pokaz(k)
 
-        if frame == self.fr - 1:
-            self.var_zero()
+        if k == self.length and self.length <= PROG_BEZ_ANIMACJI and not self.pelny:
             self.animation_aprox()
 
         return self.points, self.line
 
     def animation_aprox(self):
-        if self.obiekt_typ == "Dynamiczny":
-            frames = int(0.1 * self.N)
-        else:
-            frames = 500
-        self.anim_aprox = FuncAnimation(self.figure, self.update_plot_aprox, blit=True, frames=frames,
-                                  interval=1, repeat=False)
-
-    def update_plot_aprox(self, frame):
-        m = 1 if self.obiekt_typ == "Dynamiczny" else 2
-        for i in range(m):
-            self.var_aprox_u[m * frame + i] = self.u_aprox[m * frame + i]
-            self.var_aprox_y[m * frame + i] = self.y_m[m * frame + i]
-
-        self.line.set_data(self.var_aprox_u, self.var_aprox_y)
-
-        if frame == 999:
-            self.var_zero()
+        self.anim_aprox = FuncAnimation(self.figure, self.update_plot_aprox, blit=True, interval=15, repeat=False,
+                                        frames=self.klatki(self.length_aprox, CZAS_ANIMACJI_MODELU),
+                                        cache_frame_data=False)
 
+    def update_plot_aprox(self, k):
+        self.dec_line.pokaz(k)
         return self.points, self.line
 
-    def var_zero(self):
-        self.var_u = np.full((self.length,), None)
-        self.var_y = np.full((self.length,), None)
-        self.var_aprox_u = np.full((1000,), None)
-        self.var_aprox_y = np.full((1000,), None)
+    def zatrzymaj_animacje(self):
+        # wykres niewidoczny - animacja przerwana, od razu pełne przebiegi (wznowiona animacja,
+        # np. po zmianie rozmiaru okna, kończy się w pierwszej klatce)
+        self.pelny = True
+        for anim in (getattr(self, 'anim', None), getattr(self, 'anim_aprox', None)):
+            if anim is not None and anim.event_source is not None:
+                anim.pause()
+        self.dec_points.pokaz(self.length)
+        self.dec_line.pokaz(self.length_aprox)
+        self.canvas.draw_idle()
 
     def table(self):
         leng = 0
@@ -4610,18 +4850,18 @@ class WykresWidget(QWidget):
 
         for row in range((max(self.stopien, self.stopien_m)+1) if not self.metoda_typ == 'NLS' else leng):
             self.table_widget.setRowHeight(row, 35)
-            item = QTableWidgetItem(f"{self.b[row]:.2f}")
+            item = QTableWidgetItem(f"{self.wynik.b[row]:.2f}")
             self.table_widget.setItem(row, 0, item)
-            item = QTableWidgetItem(f"{self.b_m[row]:.2f}")
+            item = QTableWidgetItem(f"{self.wynik.b_m[row]:.2f}")
             self.table_widget.setItem(row, 1, item)
 
             if self.metoda_typ == 'NLS':
-                blad_bezwzgl = abs(self.b[row] - self.b_m[row])
+                blad_bezwzgl = abs(self.wynik.b[row] - self.wynik.b_m[row])
                 item = QTableWidgetItem(
                     f"{blad_bezwzgl:.2f}" if 100000 > blad_bezwzgl >= 0.01 else f"{blad_bezwzgl:.2e}")
                 self.table_widget.setItem(row, 2, item)
-                if self.b[row]:
-                    blad_wzgl = 100 * abs(self.b[row] - self.b_m[row]) / self.b[row]
+                if self.wynik.b[row]:
+                    blad_wzgl = 100 * abs(self.wynik.b[row] - self.wynik.b_m[row]) / self.wynik.b[row]
                     item = QTableWidgetItem(f"{blad_wzgl:.2f}%" if 100000 > blad_wzgl >= 0.01 else f"{blad_wzgl:.2e}%")
                     self.table_widget.setItem(row, 3, item)
                 else:
@@ -4629,12 +4869,12 @@ class WykresWidget(QWidget):
                     self.table_widget.setItem(row, 3, item)
 
             else:
-                blad_bezwzgl = abs(self.b[row] - self.b_m[row])
+                blad_bezwzgl = abs(self.wynik.b[row] - self.wynik.b_m[row])
                 item = QTableWidgetItem(
                     f"{blad_bezwzgl:.2f}" if 100000 > blad_bezwzgl >= 0.01 else f"{blad_bezwzgl:.2e}")
                 self.table_widget.setItem(row, 2, item)
-                if self.b[row]:
-                    blad_wzgl = 100 * abs(self.b[row] - self.b_m[row]) / self.b[row]
+                if self.wynik.b[row]:
+                    blad_wzgl = 100 * abs(self.wynik.b[row] - self.wynik.b_m[row]) / self.wynik.b[row]
                     item = QTableWidgetItem(f"{blad_wzgl:.2f}%" if 100000 > blad_wzgl >= 0.01 else f"{blad_wzgl:.2e}%")
                     self.table_widget.setItem(row, 3, item)
                 else:
@@ -4652,7 +4892,7 @@ class WykresWidget(QWidget):
         for col in range(self.stopien_m + 1):
             for row in range(self.stopien_m + 1):
                 self.macierz_cov.setRowHeight(row, 35)
-                item = QTableWidgetItem(f"{self.cov[row, col]:.2f}" if 1000 > self.cov[row, col] >= 0.01 else f"{self.cov[row, col]:.2e}")
+                item = QTableWidgetItem(f"{self.wynik.cov[row, col]:.2f}" if 1000 > self.wynik.cov[row, col] >= 0.01 else f"{self.wynik.cov[row, col]:.2e}")
                 self.macierz_cov.setItem(row, col, item)
             self.macierz_cov.setColumnWidth(col, 70)
 
@@ -4664,6 +4904,7 @@ class WykresWidget(QWidget):
         if self.obiekt_typ == 'Stacjonarny':
             self.macierz_cov.setVisible(not current_visibility)
             self.macierz_napis.setVisible(not current_visibility)
+            self.uwarunkowanie_napis.setVisible(not current_visibility)
         if current_visibility:
             self.show_button.setText('▲ Pokaż tabelę z wynikami ▲')
         else:
@@ -4679,6 +4920,45 @@ class WykresWidget(QWidget):
         self.wykresy.setCurrentWidget(self.wykresy_list[but])
 
 
+def animacja_przezroczystosci(efekt, poczatek, koniec):
+    anim = QPropertyAnimation(efekt, b"opacity")
+    anim.setStartValue(poczatek)
+    anim.setEndValue(koniec)
+    anim.setDuration(750)
+    anim.setEasingCurve(QEasingCurve.InOutCubic)
+    return anim
+
+
+class Strona:
+    # strona okna głównego tworzona przy pierwszym odwołaniu do atrybutu App, razem z efektem przezroczystości,
+    # animacjami (anim_in, anim_out - wygaszanie na czas obliczeń) i połączeniami sygnałów z App.polacz_<nazwa>
+    def __init__(self, klasa, wygaszanie=False, efekty=True):
+        self.klasa = klasa
+        self.wygaszanie = wygaszanie
+        self.efekty = efekty
+
+    def __set_name__(self, wlasciciel, nazwa):
+        self.nazwa = nazwa
+
+    def __get__(self, app, wlasciciel=None):
+        if app is None:
+            return self
+        start = perf_counter()
+        strona = self.klasa()
+        if self.efekty:
+            strona.setStyleSheet(style)
+            efekt = QGraphicsOpacityEffect(strona)
+            strona.setGraphicsEffect(efekt)
+            strona.anim_in = animacja_przezroczystosci(efekt, 0, 1)
+            if self.wygaszanie:
+                strona.anim_out = animacja_przezroczystosci(efekt, 1, 0)
+        app.central_widget.addWidget(strona)
+        setattr(app, self.nazwa, strona)        # kolejne odwołania bez udziału deskryptora
+        getattr(app, f'polacz_{self.nazwa}')(strona)
+        app.czasy_stron[self.nazwa] = perf_counter() - start
+        return strona
+
+
 class App(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -4696,161 +4976,144 @@ class App(QMainWindow):
         self.setPalette(palette)
 
         self.setCentralWidget(self.central_widget)
-        self.start = StartWidget()
-        self.menu = MainMenuWidget()
-        self.stacjo = WidokStacjonarny()
-        self.niestacjo = WidokNiestacjonarny()
-        self.nielin = WidokNieliniowy()
-        self.dynamiczny = WidokDynamiczny()
-        self.param_sym = WidokParametrySymulacji()
-        self.param_sym_niestacjo = WidokParametrySymulacjiNiestacjo()
-        self.param_sym_nielin = WidokParametrySymulacjiNielin()
-        self.param_sym_dynamiczny = WidokParametrySymulacjiDynamiczny()
-        self.metoda = WidokMetoda()
-        self.metoda_niestacjo = WidokMetodaNiestacjo()
-        self.metoda_nielin = WidokMetodaNielin()
-        self.metoda_dynamiczny = WidokMetodaDynamiczny()
-        self.RLS = WidokRLS()
-        self.RLS_zap = WidokRLSZap()
-        self.GLS = WidokGLS()
-        self.NLS = WidokNLS()
-        self.wynik = WidokWynik()
-
-        self.central_widget.addWidget(self.start)
-        self.central_widget.addWidget(self.menu)
-        self.central_widget.addWidget(self.stacjo)
-        self.central_widget.addWidget(self.niestacjo)
-        self.central_widget.addWidget(self.nielin)
-        self.central_widget.addWidget(self.dynamiczny)
-        self.central_widget.addWidget(self.param_sym)
-        self.central_widget.addWidget(self.param_sym_niestacjo)
-        self.central_widget.addWidget(self.param_sym_nielin)
-        self.central_widget.addWidget(self.param_sym_dynamiczny)
-        self.central_widget.addWidget(self.metoda)
-        self.central_widget.addWidget(self.metoda_niestacjo)
-        self.central_widget.addWidget(self.metoda_nielin)
-        self.central_widget.addWidget(self.metoda_dynamiczny)
-        self.central_widget.addWidget(self.RLS)
-        self.central_widget.addWidget(self.RLS_zap)
-        self.central_widget.addWidget(self.GLS)
-        self.central_widget.addWidget(self.NLS)
-        self.central_widget.addWidget(self.wynik)
-
-        self.animations_in = []
-        self.animations_out = []
-
-        for index in range(self.central_widget.count() - 1):
-            widget = self.central_widget.widget(index)
-            widget.setStyleSheet(style)
-            effect = QGraphicsOpacityEffect(widget)
-            widget.setGraphicsEffect(effect)
-            anim_in = QPropertyAnimation(effect, b"opacity")
-            anim_in.setStartValue(0)
-            anim_in.setEndValue(1)
-            anim_in.setDuration(750)
-            anim_in.setEasingCurve(QEasingCurve.InOutCubic)
-            self.animations_in.append(anim_in)
-            if index in [10, 13, 14, 15, 16, 17]:
-                anim_out = QPropertyAnimation(effect, b"opacity")
-                anim_out.setStartValue(1)
-                anim_out.setEndValue(0)
-                anim_out.setDuration(750)
-                anim_out.setEasingCurve(QEasingCurve.InOutCubic)
-                self.animations_out.append(anim_out)
-
-        self.time = QTimer(self)
-        self.time.setInterval(750)
-        self.time.timeout.connect(self.open_wynik)
-
-        self.open_start()
-
-        self.start.start.clicked.connect(self.open_menu)
-
-        self.menu.button_stacjo.clicked.connect(self.open_stacjo)
-        self.menu.button_niestacjo.clicked.connect(self.open_niestacjo)
-        self.menu.button_nielin.clicked.connect(self.open_nielin)
-        self.menu.button_dynamiczny.clicked.connect(self.open_dynamiczny)
-
-        self.stacjo.button_return.clicked.connect(self.open_menu)
-        self.stacjo.button_param_sym.clicked.connect(self.open_param_sym)
-
-        self.param_sym.button_metoda.clicked.connect(self.open_metoda)
-        self.param_sym.button_return.clicked.connect(self.open_stacjo)
-
-        self.niestacjo.button_return.clicked.connect(self.open_menu)
-        self.niestacjo.button_param_sym.clicked.connect(self.open_param_sym_niestacjo)
-
-        self.param_sym_niestacjo.button_metoda.clicked.connect(self.open_metoda_niestacjo)
-        self.param_sym_niestacjo.button_return.clicked.connect(self.open_niestacjo)
-
-        self.nielin.button_return.clicked.connect(self.open_menu)
-        self.nielin.button_param_sym.clicked.connect(self.open_param_sym_nielin)
 
-        self.param_sym_nielin.button_metoda.clicked.connect(self.open_metoda_nielin)
-        self.param_sym_nielin.button_return.clicked.connect(self.open_nielin)
+        self.zadanie = None
+        self.czasy_stron = {}           # czas utworzenia poszczególnych stron, do raportu czasu uruchamiania
 
-        self.dynamiczny.button_return.clicked.connect(self.open_menu)
-        self.dynamiczny.button_param_sym.clicked.connect(self.open_param_sym_dynamiczny)
-
-        self.param_sym_dynamiczny.button_metoda.clicked.connect(self.open_metoda_dynamiczny)
-        self.param_sym_dynamiczny.button_return.clicked.connect(self.open_dynamiczny)
-
-        self.metoda.button_LS.clicked.connect(self.open_wynik_LS)
-        self.metoda.button_RLS.clicked.connect(self.open_RLS)
-        self.metoda.button_GLS.clicked.connect(self.open_GLS)
-        self.metoda.button_return.clicked.connect(self.open_param_sym)
-
-        self.metoda_niestacjo.button_RLS_zap.clicked.connect(self.open_RLS_zap)
-        self.metoda_niestacjo.button_return.clicked.connect(self.open_param_sym_niestacjo)
-
-        self.metoda_nielin.button_NLS.clicked.connect(self.open_NLS)
-        self.metoda_nielin.button_return.clicked.connect(self.open_param_sym_nielin)
-
-        self.metoda_dynamiczny.button_korel.clicked.connect(self.open_wynik_korel)
-        self.metoda_dynamiczny.button_return.clicked.connect(self.open_param_sym_dynamiczny)
-
-        self.RLS.button_return.clicked.connect(self.open_metoda)
-        self.RLS.button_wynik.clicked.connect(self.open_wynik_RLS)
-
-        self.RLS_zap.button_return.clicked.connect(self.open_metoda_niestacjo)
-        self.RLS_zap.button_wynik.clicked.connect(self.open_wynik_RLS_zap)
-
-        self.GLS.button_return.clicked.connect(self.open_metoda)
-        self.GLS.button_wynik.clicked.connect(self.open_wynik_GLS)
-
-        self.NLS.button_return.clicked.connect(self.open_metoda_nielin)
-        self.NLS.button_wynik.clicked.connect(self.open_wynik_NLS)
+        self.open_start()
 
-        self.wynik.button_return.clicked.connect(self.open_menu)
+    def closeEvent(self, event):
+        if 'wynik' in vars(self):       # strona wyników została utworzona
+            self.wynik.zamknij()
+        super().closeEvent(event)
+
+    # strony tworzone przy pierwszym wejściu
+    start = Strona(StartWidget)
+    menu = Strona(MainMenuWidget)
+    stacjo = Strona(WidokStacjonarny)
+    niestacjo = Strona(WidokNiestacjonarny)
+    nielin = Strona(WidokNieliniowy)
+    dynamiczny = Strona(WidokDynamiczny)
+    param_sym = Strona(WidokParametrySymulacji)
+    param_sym_niestacjo = Strona(WidokParametrySymulacjiNiestacjo)
+    param_sym_nielin = Strona(WidokParametrySymulacjiNielin)
+    param_sym_dynamiczny = Strona(WidokParametrySymulacjiDynamiczny)
+    metoda = Strona(WidokMetoda, wygaszanie=True)
+    metoda_niestacjo = Strona(WidokMetodaNiestacjo)
+    metoda_nielin = Strona(WidokMetodaNielin)
+    metoda_dynamiczny = Strona(WidokMetodaDynamiczny, wygaszanie=True)
+    RLS = Strona(WidokRLS, wygaszanie=True)
+    RLS_zap = Strona(WidokRLSZap, wygaszanie=True)
+    GLS = Strona(WidokGLS, wygaszanie=True)
+    NLS = Strona(WidokNLS, wygaszanie=True)
+    wynik = Strona(WidokWynik, efekty=False)
+
+    def polacz_start(self, strona):
+        strona.start.clicked.connect(self.open_menu)
+
+    def polacz_menu(self, strona):
+        strona.button_stacjo.clicked.connect(self.open_stacjo)
+        strona.button_niestacjo.clicked.connect(self.open_niestacjo)
+        strona.button_nielin.clicked.connect(self.open_nielin)
+        strona.button_dynamiczny.clicked.connect(self.open_dynamiczny)
+
+    def polacz_stacjo(self, strona):
+        strona.button_return.clicked.connect(self.open_menu)
+        strona.button_param_sym.clicked.connect(self.open_param_sym)
+
+    def polacz_param_sym(self, strona):
+        strona.button_metoda.clicked.connect(self.open_metoda)
+        strona.button_return.clicked.connect(self.open_stacjo)
+
+    def polacz_niestacjo(self, strona):
+        strona.button_return.clicked.connect(self.open_menu)
+        strona.button_param_sym.clicked.connect(self.open_param_sym_niestacjo)
+
+    def polacz_param_sym_niestacjo(self, strona):
+        strona.button_metoda.clicked.connect(self.open_metoda_niestacjo)
+        strona.button_return.clicked.connect(self.open_niestacjo)
+
+    def polacz_nielin(self, strona):
+        strona.button_return.clicked.connect(self.open_menu)
+        strona.button_param_sym.clicked.connect(self.open_param_sym_nielin)
+
+    def polacz_param_sym_nielin(self, strona):
+        strona.button_metoda.clicked.connect(self.open_metoda_nielin)
+        strona.button_return.clicked.connect(self.open_nielin)
+
+    def polacz_dynamiczny(self, strona):
+        strona.button_return.clicked.connect(self.open_menu)
+        strona.button_param_sym.clicked.connect(self.open_param_sym_dynamiczny)
+
+    def polacz_param_sym_dynamiczny(self, strona):
+        strona.button_metoda.clicked.connect(self.open_metoda_dynamiczny)
+        strona.button_return.clicked.connect(self.open_dynamiczny)
+
+    def polacz_metoda(self, strona):
+        strona.button_LS.clicked.connect(self.open_wynik_LS)
+        strona.button_RLS.clicked.connect(self.open_RLS)
+        strona.button_GLS.clicked.connect(self.open_GLS)
+        strona.button_return.clicked.connect(self.open_param_sym)
+
+    def polacz_metoda_niestacjo(self, strona):
+        strona.button_RLS_zap.clicked.connect(self.open_RLS_zap)
+        strona.button_return.clicked.connect(self.open_param_sym_niestacjo)
+
+    def polacz_metoda_nielin(self, strona):
+        strona.button_NLS.clicked.connect(self.open_NLS)
+        strona.button_return.clicked.connect(self.open_param_sym_nielin)
+
+    def polacz_metoda_dynamiczny(self, strona):
+        strona.button_korel.clicked.connect(self.open_wynik_korel)
+        strona.button_return.clicked.connect(self.open_param_sym_dynamiczny)
+
+    def polacz_RLS(self, strona):
+        strona.button_return.clicked.connect(self.open_metoda)
+        strona.button_wynik.clicked.connect(self.open_wynik_RLS)
+
+    def polacz_RLS_zap(self, strona):
+        strona.button_return.clicked.connect(self.open_metoda_niestacjo)
+        strona.button_wynik.clicked.connect(self.open_wynik_RLS_zap)
+
+    def polacz_GLS(self, strona):
+        strona.button_return.clicked.connect(self.open_metoda)
+        strona.button_wynik.clicked.connect(self.open_wynik_GLS)
+
+    def polacz_NLS(self, strona):
+        strona.button_return.clicked.connect(self.open_metoda_nielin)
+        strona.button_wynik.clicked.connect(self.open_wynik_NLS)
+
+    def polacz_wynik(self, strona):
+        strona.button_return.clicked.connect(self.open_menu)
 
     def open_start(self):
         self.central_widget.setCurrentWidget(self.start)
-        self.animations_in[0].start()
+        self.start.anim_in.start()
 
     def open_menu(self):
         self.central_widget.setCurrentWidget(self.menu)
-        self.animations_in[1].start()
+        self.menu.anim_in.start()
 
 
     def open_stacjo(self):
         self.central_widget.setCurrentWidget(self.stacjo)
-        self.animations_in[2].start()
+        self.stacjo.anim_in.start()
 
     def open_niestacjo(self):
         self.central_widget.setCurrentWidget(self.niestacjo)
-        self.animations_in[3].start()
+        self.niestacjo.anim_in.start()
 
     def open_nielin(self):
         self.central_widget.setCurrentWidget(self.nielin)
-        self.animations_in[4].start()
+        self.nielin.anim_in.start()
 
     def open_dynamiczny(self):
         self.central_widget.setCurrentWidget(self.dynamiczny)
-        self.animations_in[5].start()
+        self.dynamiczny.anim_in.start()
 
     def open_param_sym(self):
         self.central_widget.setCurrentWidget(self.param_sym)
-        self.animations_in[6].start()
+        self.param_sym.anim_in.start()
         if isinstance(self.sender().parent(), WidokStacjonarny):
             typ, rzad, parametry = self.stacjo.result()
             self.param_sym.edit(rzad)
@@ -4858,7 +5121,7 @@ class App(QMainWindow):
 
     def open_param_sym_niestacjo(self):
         self.central_widget.setCurrentWidget(self.param_sym_niestacjo)
-        self.animations_in[7].start()
+        self.param_sym_niestacjo.anim_in.start()
         if isinstance(self.sender().parent(), WidokNiestacjonarny):
             typ, rzad, parametry = self.niestacjo.result()
             self.param_sym_niestacjo.edit(rzad)
@@ -4866,7 +5129,7 @@ class App(QMainWindow):
 
     def open_param_sym_nielin(self):
         self.central_widget.setCurrentWidget(self.param_sym_nielin)
-        self.animations_in[8].start()
+        self.param_sym_nielin.anim_in.start()
         if isinstance(self.sender().parent(), WidokNieliniowy):
             typ = self.nielin.result()[0]
             self.NLS.edit_typ(typ)
@@ -4886,7 +5149,7 @@ class App(QMainWindow):
 
     def open_param_sym_dynamiczny(self):
         self.central_widget.setCurrentWidget(self.param_sym_dynamiczny)
-        self.animations_in[9].start()
+        self.param_sym_dynamiczny.anim_in.start()
         if isinstance(self.sender().parent(), WidokDynamiczny):
             typ = self.dynamiczny.result()[0]
             match typ:
@@ -4902,35 +5165,33 @@ class App(QMainWindow):
 
     def open_metoda(self):
         self.central_widget.setCurrentWidget(self.metoda)
-        self.animations_in[10].start()
+        self.metoda.anim_in.start()
         rzad_m, N, zakr_min, zakr_max, zakl = self.param_sym.result()
         self.parametry = ust.Parametry(self.obkt, rzad_m, N, zakr_min, zakr_max, zakl)
 
     def open_metoda_niestacjo(self):
         self.central_widget.setCurrentWidget(self.metoda_niestacjo)
-        self.animations_in[11].start()
+        self.metoda_niestacjo.anim_in.start()
         N, range_min, range_max, wymuszenie_typ, zakl = self.param_sym_niestacjo.result()
         self.parametry_niestacjo = ust.ParametryNiestacjo(self.obkt, N, range_min, range_max, wymuszenie_typ, zakl)
 
     def open_metoda_nielin(self):
         self.central_widget.setCurrentWidget(self.metoda_nielin)
-        self.animations_in[12].start()
+        self.metoda_nielin.anim_in.start()
         N, range_min, range_max, zakl = self.param_sym_nielin.result()
         self.parametry_nielin = ust.ParametryNieliniowy(self.obkt, N, range_min, range_max, zakl)
         self.NLS.canvas.setVisible(False)
 
     def open_metoda_dynamiczny(self):
         self.central_widget.setCurrentWidget(self.metoda_dynamiczny)
-        self.animations_in[13].start()
+        self.metoda_dynamiczny.anim_in.start()
         N, range_max, zakl_w, zakl = self.param_sym_dynamiczny.result()
         self.parametry = ust.ParametryDynamiczny(self.obkt, N, range_max, zakl_w, zakl)
 
     def open_wynik_LS(self):
         try:
-            self.ob_LS = ust.LS(self.obkt, self.parametry)
-            self.animations_out[0].start()
-            self.wynik.rysuj_wyniki(self.obkt, self.parametry, self.ob_LS)
-            self.time.start()
+            metoda = ust.LS(self.obkt, self.parametry)
+            self.oblicz(metoda, self.parametry, self.metoda)
         except Exception as e:
             self.blad = BladWidget(self.metoda, e)
             self.central_widget.addWidget(self.blad)
@@ -4939,15 +5200,14 @@ class App(QMainWindow):
     def open_RLS(self):
         self.RLS.edit(self.param_sym.result()[0], self.param_sym.result()[1])
         self.central_widget.setCurrentWidget(self.RLS)
-        self.animations_in[14].start()
+        self.RLS.anim_in.start()
 
     def open_wynik_RLS(self):
         alfa, b0, N_pocz = self.RLS.result()
         try:
-            self.ob_RLS = ust.RLS(self.obkt, self.parametry, alfa, b0, N_pocz)
-            self.animations_out[2].start()
-            self.wynik.rysuj_wyniki(self.obkt, self.parametry, self.ob_RLS)
-            self.time.start()
+            metoda = ust.RLS(self.obkt, self.parametry, alfa, b0, N_pocz,
+                                  pierwiastkowy=self.RLS.pierwiastkowy)
+            self.oblicz(metoda, self.parametry, self.RLS)
         except Exception as e:
             self.blad = BladWidget(self.RLS, e)
             self.central_widget.addWidget(self.blad)
@@ -4956,15 +5216,14 @@ class App(QMainWindow):
     def open_RLS_zap(self):
         self.RLS_zap.edit_b0(self.niestacjo.result()[1])
         self.central_widget.setCurrentWidget(self.RLS_zap)
-        self.animations_in[15].start()
+        self.RLS_zap.anim_in.start()
 
     def open_wynik_RLS_zap(self):
         alfa, b0, wsp_zap = self.RLS_zap.result()
         try:
-            self.ob_RLS_zap = ust.RLSZapominanie(self.obkt, self.parametry_niestacjo, alfa, b0, wsp_zap)
-            self.animations_out[3].start()
-            self.wynik.rysuj_wyniki(self.obkt, self.parametry_niestacjo, self.ob_RLS_zap)
-            self.time.start()
+            metoda = ust.RLSZapominanie(self.obkt, self.parametry_niestacjo, alfa, b0, wsp_zap,
+                                                  pierwiastkowy=self.RLS_zap.pierwiastkowy)
+            self.oblicz(metoda, self.parametry_niestacjo, self.RLS_zap)
         except Exception as e:
             self.blad = BladWidget(self.RLS_zap, e)
             self.central_widget.addWidget(self.blad)
@@ -4973,16 +5232,14 @@ class App(QMainWindow):
     def open_GLS(self):
         self.GLS.edit_N(self.param_sym.result()[1])
         self.central_widget.setCurrentWidget(self.GLS)
-        self.animations_in[16].start()
+        self.GLS.anim_in.start()
 
     def open_wynik_GLS(self):
         algorytm, przek_wart = self.GLS.result()
         try:
             self.ob_GLS = ust.GLS(self.obkt, self.parametry, przek_wart, algorytm)
             if self.ob_GLS.check():
-                self.animations_out[4].start()
-                self.wynik.rysuj_wyniki(self.obkt, self.parametry, self.ob_GLS)
-                self.time.start()
+                self.oblicz(self.ob_GLS, self.parametry, self.GLS)
             else:
                 self.GLS.blad_macierz.setText('Macierz nie jest dodatnio określona - wymagana korekta macierzy')
                 self.GLS.button_macierz.setVisible(True)
@@ -4998,8 +5255,8 @@ class App(QMainWindow):
         u, y = self.parametry_nielin.calc_ret()
         self.central_widget.setCurrentWidget(self.NLS)
         self.NLS.figure.clear()
-        self.animations_in[17].start()
-        self.animations_in[17].finished.connect(plot)
+        self.NLS.anim_in.start()
+        self.NLS.anim_in.finished.connect(plot)
 
     def open_wynik_NLS(self):
         self.NLS.canvas.setVisible(False)
@@ -5007,16 +5264,17 @@ class App(QMainWindow):
             match self.obkt.ret()[1]:
                 case 'sinus':
                     iter, amp_0, T_0, przes_0, skl_0 = self.NLS.result()
-                    self.ob_NLS = ust.NLS(self.obkt, self.parametry_nielin, iter, amp_0, T_0, przes_0, skl_0)
+                    metoda = ust.NLS(self.obkt, self.parametry_nielin, iter, amp_0, T_0, przes_0, skl_0,
+                                          wielostart=64 if self.NLS.wielostart else 0)
                 case 'sinus_2':
                     iter, amp_0, T_0, przes_0, amp2_0, T2_0, przes2_0, skl_0 = self.NLS.result()
-                    self.ob_NLS = ust.NLS(self.obkt, self.parametry_nielin, iter, amp_0, T_0, przes_0, amp2_0, T2_0, przes2_0, skl_0)
+                    metoda = ust.NLS(self.obkt, self.parametry_nielin, iter, amp_0, T_0, przes_0, amp2_0, T2_0, przes2_0, skl_0,
+                                          wielostart=64 if self.NLS.wielostart else 0)
                 case 'exp':
                     iter, amp_0, st_czas_0, skl_0 = self.NLS.result()
-                    self.ob_NLS = ust.NLS(self.obkt, self.parametry_nielin, iter, amp_0, st_czas_0, skl_0)
-            self.animations_out[5].start()
-            self.wynik.rysuj_wyniki(self.obkt, self.parametry_nielin, self.ob_NLS)
-            self.time.start()
+                    metoda = ust.NLS(self.obkt, self.parametry_nielin, iter, amp_0, st_czas_0, skl_0,
+                                          wielostart=64 if self.NLS.wielostart else 0)
+            self.oblicz(metoda, self.parametry_nielin, self.NLS)
         except Exception as e:
             self.NLS.canvas.setVisible(True)
             self.blad = BladWidget(self.NLS, e)
@@ -5025,18 +5283,97 @@ class App(QMainWindow):
 
     def open_wynik_korel(self):
         try:
-            self.ob_korel = ust.Korel(self.obkt, self.parametry)
-            self.animations_out[1].start()
-            self.wynik.rysuj_wyniki(self.obkt, self.parametry, self.ob_korel)
-            self.time.start()
+            metoda = ust.Korel(self.obkt, self.parametry)
+            self.oblicz(metoda, self.parametry, self.metoda_dynamiczny)
         except Exception as e:
             self.blad = BladWidget(self.metoda_dynamiczny, e)
             self.central_widget.addWidget(self.blad)
             self.central_widget.setCurrentWidget(self.blad)
 
-    def open_wynik(self):
+    def oblicz(self, metoda, param_sym, okno):
+        # obliczenia w wątku puli, okno parametrów wygaszane w ich trakcie, wyniki pokazywane zaraz po zakończeniu;
+        # kolejne zatwierdzenie przed końcem bieżących obliczeń (okno postępu pojawia się po 300 ms) jest pomijane
+        if self.zadanie is not None:
+            return
+        self.zadanie = ZadanieObliczen(metoda)
+        self.okno_postepu = QProgressDialog("Trwają obliczenia...", "Anuluj", 0, 100, self)
+        self.okno_postepu.setWindowTitle("Obliczenia")
+        self.okno_postepu.setWindowModality(Qt.WindowModal)
+        self.okno_postepu.setMinimumDuration(300)
+        self.okno_postepu.setAutoClose(False)
+        self.okno_postepu.setAutoReset(False)
+        self.okno_postepu.canceled.connect(self.zadanie.anuluj)
+
+        sygnaly = self.zadanie.sygnaly
+        sygnaly.postep.connect(self.okno_postepu.setValue)
+        sygnaly.gotowe.connect(lambda wynik: self.open_wynik(metoda, param_sym, wynik))
+        sygnaly.blad.connect(lambda e: self.blad_obliczen(okno, e))
+        sygnaly.przerwano.connect(lambda: self.przerwano_obliczenia(okno))
+
+        okno.anim_out.start()
+        QThreadPool.globalInstance().start(self.zadanie)
+
+    def koniec_obliczen(self):
+        # okno postępu (połączone z zadaniem) usuwane, żeby nie przetrzymywało zadania i estymatora
+        self.okno_postepu.close()
+        self.okno_postepu.deleteLater()
+        self.okno_postepu = None
+        self.zadanie = None
+        self.ob_GLS = None
+
+    def open_wynik(self, metoda, param_sym, wynik):
+        self.koniec_obliczen()
+        self.wynik.rysuj_wyniki(self.obkt, param_sym, metoda, wynik)
         self.central_widget.setCurrentWidget(self.wynik)
-        self.time.stop()
+
+    def blad_obliczen(self, okno, e):
+        self.koniec_obliczen()
+        okno.anim_out.stop()
+        if okno is self.NLS:
+            self.NLS.canvas.setVisible(True)
+        self.blad = BladWidget(okno, e)
+        self.central_widget.addWidget(self.blad)
+        self.central_widget.setCurrentWidget(self.blad)
+
+    def przerwano_obliczenia(self, okno):
+        # powrót do okna parametrów
+        self.koniec_obliczen()
+        okno.anim_out.stop()
+        okno.graphicsEffect().setOpacity(1)
+        if okno is self.NLS:
+            self.NLS.canvas.setVisible(True)
+
+
+def zapisz_raport(*linie):
+    # raport czasu uruchamiania na standardowe wyjście; wersja z PyInstallera nie ma konsoli, więc dopisuje go
+    # do pliku czas_startu.txt obok programu, a gdy katalog nie jest zapisywalny - w katalogu tymczasowym
+    with BLOKADA_RAPORTU:
+        print(*linie, sep='\n')
+        if not getattr(sys, 'frozen', False):
+            return
+        for katalog in (path.dirname(executable), gettempdir()):
+            try:
+                with open(path.join(katalog, 'czas_startu.txt'), 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(linie) + '\n')
+                return
+            except OSError:
+                continue
+
+
+def wczytaj_obliczenia(raport):
+    # moduły obliczeń wczytywane w tle, gdy widoczny jest ekran startowy
+    start = perf_counter()
+    import_module('magazyn_wynikow')
+    if raport:
+        zapisz_raport(f'Moduły obliczeń (w tle):  {perf_counter() - start:.3f} s')
+
+
+def raport_startu(okno, start_okna, koniec_okna):
+    zapisz_raport(f'--- {datetime.now().isoformat(timespec="seconds")}',
+                  f'Import modułów:           {start_okna - START:.3f} s',
+                  f'Utworzenie okna:          {koniec_okna - start_okna:.3f} s',
+                  f'Pierwsze wyświetlenie:    {perf_counter() - START:.3f} s',
+                  *(f'    strona {nazwa}: {czas:.3f} s' for nazwa, czas in okno.czasy_stron.items()))
 
 
 if __name__ == '__main__':
@@ -5044,6 +5381,12 @@ if __name__ == '__main__':
         app = QApplication(argv)
     else:
         app = QApplication.instance()
+    raport = '--czas-startu' in argv
+    start_okna = perf_counter()
     window = App()
+    koniec_okna = perf_counter()
     window.show()
+    if raport:
+        QTimer.singleShot(0, lambda: raport_startu(window, start_okna, koniec_okna))
+    Thread(target=wczytaj_obliczenia, args=(raport,), daemon=True).start()
     exit(app.exec())
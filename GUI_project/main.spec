@@ -6,11 +6,11 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('logo.ico', '.'), ('logo_agh.jpg', '.')],
-    hiddenimports=[],
+    hiddenimports=['identyfikacja_ust', 'magazyn_wynikow'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['tkinter'],
     noarchive=False,
 )
 pyz = PYZ(a.pure)
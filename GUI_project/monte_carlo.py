@@ -0,0 +1,135 @@
+'''
+GUI Algorithm Simulation
+MIT License
+Copyright (c) 2024 Artur Mazurkiewicz
+'''
+
+
+
+from copy import copy
+
+import numpy as np
+
+import identyfikacja_ust as ust
+
+
+class WynikMonteCarlo:
+
+    def __init__(self, metoda_typ, b, b_m, cov_teor=None):
+        self.metoda_typ = metoda_typ
+        self.b = b                                  # wartości prawdziwe
+        self.b_m = b_m                              # estymaty z kolejnych realizacji (R x p)
+        self.R = b_m.shape[0]
+        self.srednia = b_m.mean(axis=0)
+        self.obciazenie = self.srednia - b
+        self.wariancja = b_m.var(axis=0, ddof=1)
+        self.cov_emp = np.atleast_2d(np.cov(b_m, rowvar=False))
+        self.cov_teor = cov_teor
+
+    def ret(self):
+        return self.metoda_typ, self.R, self.b, self.srednia, self.obciazenie, self.wariancja, self.cov_emp, self.cov_teor
+
+
+def wyrownaj(b, b_m):
+    # dopisanie zer dla wyższych potęg, tak jak w calc() estymatorów
+    roznica = b_m.shape[1] - len(b)
+    if roznica > 0:
+        return np.hstack((np.zeros(roznica), b)), b_m
+    return b, np.hstack((np.zeros((b_m.shape[0], -roznica)), b_m))
+
+
+def wzmocnienia_rls(U, P, start, wsp_zap=1.0, pierwiastkowy=False):
+    # wektory wzmocnienia K (p x N) i końcowa macierz P - nie zależą od wyjścia, więc liczone raz dla wszystkich
+    # realizacji; pierwiastkowy - aktualizacja czynnika P = S S^T (Potter), jak w estymatorze
+    K = np.zeros(U.shape)
+    P = np.array(P, dtype=float)
+    if pierwiastkowy:
+        S = np.linalg.cholesky(P)
+        pierw_zap = np.sqrt(wsp_zap)
+        for i in range(start, U.shape[1]):
+            fi = U[:, i] @ S
+            Sfi = S @ fi
+            alfa = fi @ fi + wsp_zap
+            K[:, i] = Sfi / alfa
+            S = (S - np.outer(Sfi / (alfa + np.sqrt(wsp_zap * alfa)), fi)) / pierw_zap
+        return K, S @ S.T
+    for i in range(start, U.shape[1]):
+        Pu = P @ U[:, i]
+        mian = U[:, i] @ Pu + wsp_zap
+        K[:, i] = Pu / mian
+        P = (P - np.outer(Pu, Pu) / mian) / wsp_zap
+    return K, P
+
+
+def rls_wsadowy(U, Y, K, B, start):
+    # estymaty wszystkich realizacji naraz: kolumny B (p x R) aktualizowane wspólnymi wzmocnieniami K
+    for i in range(start, U.shape[1]):
+        B = B + np.outer(K[:, i], Y[:, i] - U[:, i] @ B)
+    return B
+
+
+def rls_realizacje(metoda, U, Y, P, B, start, wsp_zap=1.0):
+    # estymaty końcowe dla kolejnych realizacji Y (R x N) od estymat początkowych B (p x R); aktualizacja paczkami
+    # daje na końcu przebiegu tę samą estymatę co próbka po próbce, więc wszystkie warianty liczone są wspólnymi wzmocnieniami
+    K, P_kon = wzmocnienia_rls(U, P, start, wsp_zap, metoda.pierwiastkowy)
+    return rls_wsadowy(U, Y, K, np.array(B, dtype=float), start), P_kon
+
+
+def monte_carlo(metoda, R):
+    if isinstance(metoda, ust.GLS):
+        metoda.macierze_wejsc()
+        Y = metoda.b @ metoda.U + ust.zaklocenie_skorelowane(metoda.N, metoda.przek_wart, metoda.od_std, R)
+        if metoda.algorytm == 'GLS':
+            czynnik = ust.czynnik_pasmowy(metoda.N, ust.klucz_pasm(metoda.przek_wart))
+            wybielone = ust.wybiel(czynnik, np.column_stack((metoda.U_m.T, Y.T)))
+            B, odwr, _ = ust.rozwiaz_mnk(wybielone[:, :metoda.stopien_m + 1].T, wybielone[:, metoda.stopien_m + 1:])
+            cov = metoda.sigma * odwr
+        else:
+            B, odwr, _ = ust.rozwiaz_mnk(metoda.U_m, Y.T)
+            cov = metoda.sigma * odwr @ metoda.U_m @ ust.mnoz_pasmowa(metoda.pasma, metoda.U_m.T) @ odwr
+        return WynikMonteCarlo('GLS', *wyrownaj(metoda.b, B.T), cov)
+
+    if isinstance(metoda, ust.LS):
+        metoda.macierze_wejsc()
+        Y = metoda.b @ metoda.U + metoda.od_std * np.random.randn(R, metoda.N)
+        B, odwr, _ = ust.rozwiaz_mnk(metoda.U_m, Y.T)
+        return WynikMonteCarlo('LS', *wyrownaj(metoda.b, B.T), metoda.sigma * odwr)
+
+    if isinstance(metoda, ust.RLS):
+        metoda.macierze_wejsc()
+        Y = metoda.b @ metoda.U + metoda.od_std * np.random.randn(R, metoda.N)
+        if not metoda.N_pocz:
+            P = metoda.alfa * np.eye(metoda.stopien_m + 1)
+            B = np.repeat(np.reshape(metoda.b_0, (-1, 1)), R, axis=1)
+        else:
+            B, P, _ = ust.rozwiaz_mnk(metoda.U_m[:, :metoda.N_pocz], Y[:, :metoda.N_pocz].T)
+        B, P = rls_realizacje(metoda, metoda.U_m, Y, P, B, metoda.N_pocz if metoda.N_pocz else 1)
+        return WynikMonteCarlo('RLS', *wyrownaj(metoda.b, B.T), metoda.sigma * P)
+
+    if isinstance(metoda, ust.RLSZapominanie):
+        # jedna realizacja wymuszenia, R realizacji zakłócenia
+        metoda.calc_niestacjo()
+        Y = metoda.y_wzorzec + metoda.od_std * np.random.randn(R, metoda.N)
+        B = np.repeat(np.reshape(metoda.b_0, (-1, 1)), R, axis=1)
+        B, _ = rls_realizacje(metoda, metoda.U, Y, metoda.alfa * np.eye(metoda.stopien + 1), B, 1, metoda.wsp_zap)
+        return WynikMonteCarlo('WRLS', metoda.b_wzorzec[-1], B.T)
+
+    if isinstance(metoda, ust.Korel):
+        # symulacja wszystkich realizacji jednym przebiegiem filtru, identyfikacja dla każdej osobno
+        # (na kopii estymatora - przekazany obiekt pozostaje bez zmian)
+        U, Y = metoda.realizacje(R)
+        realizacja = copy(metoda)
+        b_m = []
+        for u, y in zip(U, Y):
+            realizacja.u, realizacja.y = u, y
+            wynik = realizacja.identyfikuj()
+            b_m.append(wynik.y_m_aprox)
+        return WynikMonteCarlo(wynik.metoda_typ, wynik.y, np.array(b_m))
+
+    # estymatory nieliniowe - kolejne realizacje liczone niezależnie
+    b_m = []
+    for _ in range(R):
+        metoda.ob_param.calc()
+        wynik = metoda.calc()
+        b_m.append(wynik.b_m)
+    return WynikMonteCarlo(wynik.metoda_typ, wynik.b, np.array(b_m))
@@ -0,0 +1,181 @@
+'''
+GUI Algorithm Simulation
+MIT License
+Copyright (c) 2024 Artur Mazurkiewicz
+'''
+
+
+
+import argparse
+import json
+from os import path, makedirs
+from time import perf_counter
+
+import numpy as np
+
+import identyfikacja_ust as ust
+from magazyn_wynikow import MagazynWynikow
+from monte_carlo import monte_carlo
+
+
+# Przykładowy scenariusz (plik JSON, pojedynczy obiekt lub lista obiektów):
+# {
+#     "nazwa": "ls_st2",
+#     "obiekt": {"typ": "Stacjonarny", "stopien": 2, "b": [1.0, -2.0, 0.5]},
+#     "parametry": {"stopien_m": 2, "N": 1000, "range_min": 0.0, "range_max": 10.0, "od_std": 1.0},
+#     "metoda": {"typ": "LS"},
+#     "powtorzenia": 10
+# }
+# Klucz "monte_carlo": R zamiast pojedynczych przebiegów liczy statystyki estymatora z R realizacji zakłóceń.
+# Opcja --magazyn: wyniki w magazynie plików .npy (MagazynWynikow) zamiast plików .npz, trajektorie RLS
+# zapisywane bezpośrednio na dysk.
+
+POLA_WYNIKU = ('u', 'y', 'y_m_aprox', 'b_m', 'b', 'b_wzorzec', 'cov', 'uwarunkowanie', 'y_m')
+
+
+def utworz_obiekt(opis):
+    typ = opis['typ']
+    match typ:
+        case 'Stacjonarny':
+            return ust.ObiektLiniowy(typ, int(opis['stopien']), np.array(opis['b'], dtype=float))
+        case 'Niestacjonarny':
+            return ust.ObiektLiniowy(typ, int(opis['stopien']), [list(sublst) for sublst in opis['b']])
+        case 'sinus' | 'sinus_2' | 'exp':
+            return ust.ObiektNieliniowy(typ, *map(float, opis['wsp']))
+        case 'iner1' | 'iner2' | 'osc':
+            return ust.ObiektDynamiczny(typ, *map(float, opis['wsp']))
+    raise ValueError(f'Nieznany typ obiektu: {typ}')
+
+
+def utworz_parametry(obkt, opis):
+    if isinstance(obkt, ust.ObiektNieliniowy):
+        return ust.ParametryNieliniowy(obkt, int(opis['N']), float(opis['range_min']), float(opis['range_max']),
+                                       float(opis['od_std']))
+    if isinstance(obkt, ust.ObiektDynamiczny):
+        param = ust.ParametryDynamiczny(obkt, int(opis['N']), float(opis['range_max']), float(opis['od_std_w']),
+                                        float(opis['od_std']))
+        param.symulacja = opis.get('symulacja', param.symulacja)
+        return param
+    if obkt.typ == 'Niestacjonarny':
+        return ust.ParametryNiestacjo(obkt, int(opis['N']), float(opis['range_min']), float(opis['range_max']),
+                                      opis.get('wymuszenie_typ', 'sekwencyjne'), float(opis['od_std']))
+    return ust.Parametry(obkt, int(opis.get('stopien_m', obkt.stopien)), int(opis['N']),
+                         float(opis['range_min']), float(opis['range_max']), float(opis['od_std']))
+
+
+def utworz_metode(obkt, param, opis):
+    typ = opis['typ']
+    match typ:
+        case 'LS':
+            return ust.LS(obkt, param)
+        case 'RLS':
+            p = param.stopien_m + 1
+            b_0 = np.array(opis.get('b_0', np.zeros(p)), dtype=float).reshape(1, p)
+            return ust.RLS(obkt, param, float(opis.get('alfa', 100000000)), b_0, opis.get('N_pocz'),
+                           int(opis.get('blok', 0)), bool(opis.get('pelna', False)),
+                           bool(opis.get('pierwiastkowy', False)))
+        case 'WRLS':
+            p = param.stopien + 1
+            b_0 = np.array(opis.get('b_0', np.zeros(p)), dtype=float).reshape(1, p)
+            return ust.RLSZapominanie(obkt, param, float(opis.get('alfa', 100000000)), b_0,
+                                      float(opis.get('wsp_zap', 0.99)), int(opis.get('blok', 0)),
+                                      bool(opis.get('pelna', False)), bool(opis.get('pierwiastkowy', False)))
+        case 'GLS':
+            przek_wart = [[int(odl), float(wart)] for odl, wart in opis.get('przek_wart', [])]
+            metoda = ust.GLS(obkt, param, przek_wart, opis.get('algorytm', 'GLS'))
+            if not metoda.check():
+                if not opis.get('korekta_macierzy', False):
+                    raise ValueError('Macierz kowariancji zakłóceń nie jest dodatnio określona')
+                metoda.positive_matrix()
+            return metoda
+        case 'NLS':
+            param.calc()
+            return ust.NLS(obkt, param, int(opis.get('iter', 10)), *map(float, opis.get('start', [])),
+                           tol=float(opis.get('tol', 1e-10)), wielostart=int(opis.get('wielostart', 0)),
+                           procesy=opis.get('procesy'))
+        case 'korelacyjny':
+            return ust.Korel(obkt, param, opis.get('korelacja', 'fft'))
+    raise ValueError(f'Nieznana metoda: {typ}')
+
+
+def uruchom(scenariusz, magazyn=None, nazwa=None):
+    obkt = utworz_obiekt(scenariusz['obiekt'])
+    param = utworz_parametry(obkt, scenariusz['parametry'])
+    metoda = utworz_metode(obkt, param, scenariusz['metoda'])
+    if 'monte_carlo' in scenariusz:
+        return monte_carlo(metoda, int(scenariusz['monte_carlo']))
+    if magazyn is None:
+        return metoda.calc()
+
+    # trajektoria estymat od razu w pliku magazynu (dla WRLS jest polem b_m wyniku)
+    if isinstance(metoda, ust.RLS):
+        metoda.trajektoria = magazyn.bufor(nazwa, 'trajektoria', (metoda.stopien_m + 1, metoda.N))
+    elif isinstance(metoda, ust.RLSZapominanie):
+        metoda.trajektoria = magazyn.bufor(nazwa, 'b_m', (metoda.stopien + 1, metoda.N))
+    wynik = metoda.calc()
+    magazyn.zapisz(wynik, nazwa, {'trajektoria': metoda.trajektoria} if isinstance(metoda, ust.RLS) else None,
+                   scenariusz=scenariusz)
+    return wynik
+
+
+def zapisz_wynik(plik, wynik):
+    if not isinstance(wynik, ust.Wynik):
+        tablice = {nazwa: np.asarray(wart) for nazwa, wart in vars(wynik).items() if wart is not None}
+        np.savez(plik, **tablice)
+        return
+
+    tablice = {'metoda': np.array(wynik.metoda_typ)}
+    for nazwa in POLA_WYNIKU:
+        wart = getattr(wynik, nazwa)
+        if isinstance(wart, np.ndarray) or np.isscalar(wart):
+            tablice[nazwa] = wart        # pomijane: brak wartości i opis parametrów niestacjonarnych (zapisany w indeksie)
+    np.savez(plik, **tablice)
+
+
+def przetworz(scenariusze, katalog, ziarno=None, magazyn=False):
+    makedirs(katalog, exist_ok=True)
+    if ziarno is not None:
+        np.random.seed(ziarno)
+    magazyn = MagazynWynikow(katalog) if magazyn else None
+
+    indeks = []
+    for nr, scenariusz in enumerate(scenariusze):
+        nazwa = scenariusz.get('nazwa', f'scenariusz_{nr}')
+        for powt in range(int(scenariusz.get('powtorzenia', 1))):
+            start = perf_counter()
+            if magazyn is not None and 'monte_carlo' not in scenariusz:
+                plik = f'{nazwa}_{powt}'
+                wynik = uruchom(scenariusz, magazyn, plik)
+                czas = perf_counter() - start
+            else:
+                wynik = uruchom(scenariusz)
+                czas = perf_counter() - start
+                plik = f'{nazwa}_{powt}.npz'
+                zapisz_wynik(path.join(katalog, plik), wynik)
+            indeks.append({'nazwa': nazwa, 'powtorzenie': powt, 'plik': plik, 'metoda': wynik.metoda_typ, 'czas': czas})
+
+    with open(path.join(katalog, 'indeks.json'), 'w', encoding='utf-8') as f:
+        json.dump({'scenariusze': scenariusze, 'wyniki': indeks}, f, ensure_ascii=False, indent=2)
+    return indeks
+
+
+def wczytaj_scenariusze(plik):
+    with open(plik, encoding='utf-8') as f:
+        dane = json.load(f)
+    return dane if isinstance(dane, list) else [dane]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Wsadowe uruchamianie algorytmów identyfikacji bez interfejsu graficznego')
+    parser.add_argument('scenariusz', help='plik JSON z opisem obiektu, parametrów symulacji i metody')
+    parser.add_argument('-o', '--katalog', default='wyniki', help='katalog wyjściowy')
+    parser.add_argument('-s', '--ziarno', type=int, default=None, help='ziarno generatora liczb losowych')
+    parser.add_argument('-m', '--magazyn', action='store_true', help='zapis do magazynu plików .npy mapowanych w pamięć')
+    args = parser.parse_args(argv)
+
+    indeks = przetworz(wczytaj_scenariusze(args.scenariusz), args.katalog, args.ziarno, args.magazyn)
+    print(f'Zapisano {len(indeks)} wyników w katalogu {args.katalog}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+'''
+GUI Algorithm Simulation
+MIT License
+Copyright (c) 2024 Artur Mazurkiewicz
+'''
+
+
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from itertools import product
+from os import cpu_count
+from time import perf_counter
+
+import numpy as np
+
+from identyfikacja_ust import Wynik
+from obliczenia_wsadowe import uruchom
+
+
+# Przykładowy plik przeglądu - scenariusz jak w obliczenia_wsadowe oraz siatka wartości,
+# klucze siatki to ścieżki do pól scenariusza rozdzielone kropkami:
+# {
+#     "scenariusz": {"obiekt": {...}, "parametry": {...}, "metoda": {"typ": "RLS"}},
+#     "siatka": {"parametry.N": [100, 1000, 10000], "parametry.od_std": [0.1, 1.0], "metoda.alfa": [1e4, 1e8]}
+# }
+
+
+def rozwin_siatke(scenariusz, siatka):
+    klucze = list(siatka)
+    zadania = []
+    for wartosci in product(*(siatka[klucz] for klucz in klucze)):
+        kopia = deepcopy(scenariusz)
+        for klucz, wart in zip(klucze, wartosci):
+            *sciezka, pole = klucz.split('.')
+            miejsce = kopia
+            for nazwa in sciezka:
+                miejsce = miejsce[nazwa]
+            miejsce[pole] = wart
+        zadania.append((dict(zip(klucze, wartosci)), kopia))
+    return zadania
+
+
+def estymata_i_wzorzec(wynik):
+    match wynik.metoda_typ:
+        case 'WRLS':
+            return wynik.b_m[:, -1], wynik.b_wzorzec[-1]
+        case 'korelacyjny':
+            return wynik.y_m_aprox, wynik.y
+    return wynik.b_m, wynik.b
+
+
+def wykonaj(punkt, scenariusz, stan_ziarna):
+    # niezależny, powtarzalny strumień liczb losowych dla każdego zadania
+    np.random.seed(stan_ziarna)
+    start = perf_counter()
+    wynik = uruchom(scenariusz)
+    czas = perf_counter() - start
+
+    wiersz = dict(punkt)
+    wiersz['czas'] = czas
+    if isinstance(wynik, Wynik):
+        b_m, b = estymata_i_wzorzec(wynik)
+        wiersz['metoda'] = wynik.metoda_typ
+        wiersz['b_m'] = b_m
+        wiersz['blad'] = float(np.sqrt(np.mean((b_m - b) ** 2)))
+        wiersz['uwarunkowanie'] = np.nan if wynik.uwarunkowanie is None else wynik.uwarunkowanie
+    else:
+        wiersz['metoda'] = wynik.metoda_typ
+        wiersz['srednia'] = wynik.srednia
+        wiersz['obciazenie'] = wynik.obciazenie
+        wiersz['wariancja'] = wynik.wariancja
+    return wiersz
+
+
+def do_kolumn(wiersze):
+    # tabela kolumnowa: nazwa kolumny -> tablica (wektory o równej długości łączone w macierz)
+    kolumny = {}
+    for nazwa in wiersze[0]:
+        wartosci = [wiersz.get(nazwa) for wiersz in wiersze]
+        try:
+            kolumny[nazwa] = np.array(wartosci)
+        except ValueError:
+            kolumny[nazwa] = np.array(wartosci, dtype=object)
+    return kolumny
+
+
+def przeglad(scenariusz, siatka, procesy=None, ziarno=None):
+    zadania = rozwin_siatke(scenariusz, siatka)
+    stany = [sekw.generate_state(4) for sekw in np.random.SeedSequence(ziarno).spawn(len(zadania))]
+    punkty, scenariusze = zip(*zadania)
+
+    procesy = procesy or cpu_count()
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        wiersze = list(pula.map(wykonaj, punkty, scenariusze, stany,
+                                chunksize=max(1, len(zadania) // (4 * procesy))))
+    return do_kolumn(wiersze)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Równoległy przegląd parametrów symulacji')
+    parser.add_argument('plik', help='plik JSON ze scenariuszem i siatką parametrów')
+    parser.add_argument('-o', '--wynik', default='przeglad.npz', help='plik wyjściowy z tabelą wyników')
+    parser.add_argument('-p', '--procesy', type=int, default=None, help='liczba procesów (domyślnie liczba rdzeni)')
+    parser.add_argument('-s', '--ziarno', type=int, default=None, help='ziarno generatora liczb losowych')
+    args = parser.parse_args(argv)
+
+    with open(args.plik, encoding='utf-8') as f:
+        opis = json.load(f)
+
+    start = perf_counter()
+    tabela = przeglad(opis['scenariusz'], opis['siatka'], args.procesy, args.ziarno)
+    np.savez(args.wynik, **tabela)
+    print(f'Zapisano {len(tabela["czas"])} przebiegów w pliku {args.wynik} ({perf_counter() - start:.2f} s)')
+
+
+if __name__ == '__main__':
+    main()
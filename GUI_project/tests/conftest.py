@@ -0,0 +1,5 @@
+import sys
+from os import path
+
+# moduły programu leżą płasko w katalogu GUI_project
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
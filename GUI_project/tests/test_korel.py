@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+import identyfikacja_ust as ust
+
+
+# pary (N, range_max), dla których np.arange(0, 0.1 * range_max, dt) dawało nmax + 1 próbek
+@pytest.mark.parametrize('N, range_max', [(1000, 3), (500, 7), (200, 20), (2000, 20), (300, 11)])
+def test_dlugosci_wyniku_korelacyjnego(N, range_max):
+    np.random.seed(0)
+    obkt = ust.ObiektDynamiczny('iner1', 2, 1.5)
+    param = ust.ParametryDynamiczny(obkt, N, range_max, 1, 0.1)
+    wynik = ust.Korel(obkt, param).calc()
+
+    nmax = int(0.1 * N)
+    assert len(wynik.u) == len(wynik.y) == len(wynik.y_m_aprox) == nmax
+    assert wynik.blad.shape == (nmax,)
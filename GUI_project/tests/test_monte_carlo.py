@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import identyfikacja_ust as ust
+import monte_carlo as mc
+
+
+@pytest.mark.parametrize('N, range_max', [(1000, 3), (500, 7)])
+def test_korel(N, range_max):
+    np.random.seed(0)
+    obkt = ust.ObiektDynamiczny('iner1', 2, 1.5)
+    param = ust.ParametryDynamiczny(obkt, N, range_max, 1, 0.1)
+    param.calc()
+    wynik = mc.monte_carlo(ust.Korel(obkt, param), 5)
+
+    assert wynik.b_m.shape == (5, int(0.1 * N))
+    assert wynik.obciazenie.shape == wynik.b.shape
+
+
+@pytest.mark.parametrize('opcje', [{}, {'blok': 16}, {'pierwiastkowy': True}])
+def test_rls_realizacje_jak_estymator(opcje):
+    np.random.seed(1)
+    obkt = ust.ObiektLiniowy('Stacjonarny', 2, np.array([1., -2, .5]))
+    metoda = ust.RLS(obkt, ust.Parametry(obkt, 2, 300, 0, 10, 1), 1e4, np.zeros((1, 3)), None, **opcje)
+    metoda.macierze_wejsc()
+    Y = metoda.b @ metoda.U + np.random.randn(4, metoda.N)
+    P = metoda.alfa * np.eye(3)
+    B, P_kon = mc.rls_realizacje(metoda, metoda.U_m, Y, P, np.zeros((3, 4)), 1)
+
+    b_ = np.zeros(metoda.U_m.shape)
+    for r, y in enumerate(Y):
+        P_est = ust.rls(metoda.U_m, y, P, b_, 1, 1.0, metoda.blok, metoda.pelna, metoda.pierwiastkowy)
+        np.testing.assert_allclose(B[:, r], b_[:, -1], rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(P_kon, P_est, rtol=1e-8, atol=1e-12)
@@ -0,0 +1,16 @@
+import numpy as np
+
+import przeglad_parametrow as pp
+
+
+def test_przeglad_korelacyjny():
+    # (1000, 3) i (500, 7) - dawniej oś przesunięć o jedną próbkę dłuższa od estymaty
+    scenariusz = {'obiekt': {'typ': 'iner1', 'wsp': [2, 1.5]},
+                  'parametry': {'N': 1000, 'range_max': 3, 'od_std_w': 1, 'od_std': 0.1},
+                  'metoda': {'typ': 'korelacyjny'}}
+    siatka = {'parametry.N': [1000, 500], 'parametry.range_max': [3, 7]}
+    tabela = pp.przeglad(scenariusz, siatka, procesy=2, ziarno=0)
+
+    assert len(tabela['czas']) == 4
+    assert list(tabela['metoda']) == ['korelacyjny'] * 4
+    assert np.all(np.isfinite(tabela['blad']))